@@ -5,26 +5,39 @@ This module implements a coding agent capable of dynamically generating
 Factorio Lua scripts and wrapping them into reusable function tools.
 """
 import logging
+import functools
+import importlib.util
 import json
 import os
+import py_compile
+import re
 import asyncio
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple, Union
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
-from agents import Agent, Runner, function_tool, set_default_openai_key, set_trace_processors
-from langsmith.wrappers import OpenAIAgentsTracingProcessor
-from agents.extensions.models.litellm_model import LitellmModel
-import toml
-import json
+from agents import Agent, RunConfig, Runner, function_tool, set_default_openai_key, set_trace_processors
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(data: Any) -> str:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS, default=str).decode()
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(data: Any) -> str:
+        return json.dumps(data, separators=(",", ":"), default=str)
 
+from agent.runtime import get_config
 from agent.tool.agent_tools import (
     query_wiki_knowledge_base,
     query_api_knowledge_base
 )
-import lupa.lua52 as lupa
+from utils.log_queue import configure_queue_logging
 
-config = toml.load("config/config.toml")
+config = get_config()
 set_default_openai_key(config["openai"]["OPENAI_API_KEY"])
 
 os.environ["LANGSMITH_TRACING"] = str(config["langsmith"]["tracing"]).lower()
@@ -32,6 +45,146 @@ os.environ["LANGSMITH_ENDPOINT"] = config["langsmith"]["endpoint"]
 os.environ["LANGSMITH_API_KEY"] = config["langsmith"]["api_key"]
 os.environ["LANGSMITH_PROJECT"] = config["langsmith"]["project"]
 
+
+@dataclass
+class ScriptParameter:
+    """A placeholder of a generated Lua script, as passed by the model"""
+    name: str
+    description: str
+
+@dataclass
+class MetadataUpdate:
+    """
+    A single script metadata field to change, as passed by the model.
+    Strict tool schemas cannot express an arbitrary JSON value, so value is a string
+    that is decoded as JSON unless the field currently holds a string.
+    """
+    key: str
+    value: str
+
+def _decode_update_value(value: str, current: Any) -> Any:
+    """Decode a MetadataUpdate value for a field whose current value is current"""
+    if isinstance(current, str):
+        return value
+    try:
+        return _json_loads(value)
+    except json.JSONDecodeError:
+        return value
+
+
+# A {name} placeholder, or any other single brace (Lua table constructors)
+_PLACEHOLDER_RE = re.compile(r"\{(\w+)\}|[{}]")
+
+# Source of a generated script wrapper, filled in by CodingAgent.generate_python_wrapper()
+_WRAPPER_TEMPLATE = '''"""
+{description}
+
+This is a dynamically generated Python wrapper for a parameterized Factorio Lua script.
+Generated at: {timestamp}
+"""
+import functools
+from typing import Dict, Any
+from agent.runtime import get_factorio_interface
+
+# The Lua script template, specialized for this wrapper's parameters
+_TEMPLATE = {template_literal}
+{render_code}
+def {script_name}({param_list}) -> Dict[str, Any]:
+    """
+    {description}
+    
+    Args:{param_docs}
+        
+    Returns:
+        Dict containing operation results and status information
+    """
+    try:{param_replacement_code}
+        # Execute the parameterized Lua script via RCON
+        factorio = get_factorio_interface()
+        output = factorio._send_command({script_expr})
+        
+        result = {{
+            "executed": True,
+            "output": output,
+            "script_name": "{script_name}",
+            "parameters": {{{param_dict_str}}},
+        }}
+        
+        return result
+        
+    except Exception as e:
+        return {{
+            "executed": False,
+            "message": f"Script execution failed: {{str(e)}}",
+            "error": str(e),
+            "script_name": "{script_name}",
+            "parameters": {{{param_dict_str}}}
+        }}
+
+
+# Script metadata for registry
+SCRIPT_METADATA = {{
+    "name": "{script_name}",
+    "description": "{description}",
+    "parameters": {parameters_json},
+    "placeholder_count": {placeholder_count},
+    "version": "{version}"
+}}
+'''
+
+def _format_template(lua_script: str, parameters: Dict[str, str]) -> Tuple[str, int]:
+    """
+    Turn a Lua script into a str.format template for the given parameters, in a single pass.
+
+    Returns:
+        The template, in which only the declared {name} placeholders remain format fields,
+        and the number of those placeholders in the script
+    """
+    placeholder_count = 0
+
+    def to_field(match: "re.Match[str]") -> str:
+        nonlocal placeholder_count
+        if match.group(1) in parameters:
+            placeholder_count += 1
+            return match.group(0)
+        return match.group(0).replace("{", "{{").replace("}", "}}")
+
+    return _PLACEHOLDER_RE.sub(to_field, lua_script), placeholder_count
+
+@functools.lru_cache(maxsize=256)
+def _lua_syntax_error(lua_runtime: Any, code: str) -> Optional[str]:
+    """Compile a Lua chunk without running it; return the syntax error message, or None if it parses"""
+    # Only reached with a runtime from _init_lua_runtime, so lupa is importable
+    import lupa.lua52 as lupa
+    try:
+        lua_runtime.compile(code)
+    except lupa.LuaError as e:
+        return str(e)
+    return None
+
+def _write_text_atomic(path: Path, text: str) -> None:
+    """Write text next to path and move it into place, so a crash never leaves a half-written file"""
+    tmp_file = path.with_suffix(path.suffix + ".tmp")
+    tmp_file.write_text(text, encoding="utf-8")
+    tmp_file.replace(path)
+
+def _write_module_atomic(path: Path, source: str) -> None:
+    """
+    Like _write_text_atomic(), for a Python module: the source is compiled into __pycache__
+    before it is moved into place, so a module that fails to compile is never left on disk.
+    Hash-checked bytecode is invalidated by content, so a module rewritten within the same
+    second (same mtime) is never served from stale bytecode.
+    """
+    tmp_file = path.with_suffix(path.suffix + ".tmp")
+    tmp_file.write_text(source, encoding="utf-8")
+    try:
+        py_compile.compile(str(tmp_file), cfile=importlib.util.cache_from_source(str(path)), dfile=str(path),
+                           doraise=True, invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH)
+    except py_compile.PyCompileError:
+        tmp_file.unlink()
+        raise
+    tmp_file.replace(path)
+
 class CodingAgent:
     """
     Advanced coding agent for dynamic Factorio Lua script generation
@@ -44,7 +197,7 @@ class CodingAgent:
         Args:
             config_path: Path to configuration file
         """
-        self.config = toml.load(config_path)
+        self.config = get_config(config_path)
         self.logger = self._setup_logging()
         
         # Storage paths - only for temporary generation, actual storage managed by UnifiedToolManager
@@ -56,9 +209,14 @@ class CodingAgent:
         
         # Tool manager reference - will be set by UnifiedToolManager
         self.tool_manager = None
+        # Names of the scripts saved by this agent, oldest first, so callers can tell
+        # what a run created without rescanning the registry
+        self.saved_scripts: List[str] = []
         
         # Create the agent
         self.agent = self._create_agent()
+        # Shared by every run: a default RunConfig builds a new model provider and OpenAI client per run
+        self.run_config = RunConfig()
         
     def set_tool_manager(self, tool_manager):
         """
@@ -71,19 +229,17 @@ class CodingAgent:
         
     def _setup_logging(self) -> logging.Logger:
         """Setup logging configuration"""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            filename='coding_agent.log'
-        )
+        configure_queue_logging('coding_agent.log', level=logging.INFO)
         return logging.getLogger('coding_agent')
     
     def _init_lua_runtime(self) -> Optional[Any]:
         """Initialize Lua runtime for validation"""
         try:
+            # Imported here so the agent still works, without syntax validation, when lupa is missing
+            import lupa.lua52 as lupa
             return lupa.LuaRuntime(unpack_returned_tuples=True)
         except Exception as e:
-            self.logger.warning(f"Failed to initialize Lua runtime: {e}")
+            self.logger.warning("Failed to initialize Lua runtime: %s", e)
             return None
     
     def _create_agent(self) -> Agent:
@@ -147,7 +303,7 @@ After generating the parameterized Lua code, use save_generated_lua_script to sa
 """
 
         # Create tool functions that reference this instance
-        def save_generated_lua_script(script_name: str, lua_code: str, description: str, parameters_json: str = "{}") -> str:
+        async def save_generated_lua_script(script_name: str, lua_code: str, description: str, parameters: List[ScriptParameter]) -> str:
             """
             Save a generated Lua script to the registry and filesystem.
             This tool should be used by the AI after generating the actual Lua code.
@@ -156,12 +312,13 @@ After generating the parameterized Lua code, use save_generated_lua_script to sa
                 script_name: Name for the script
                 lua_code: The complete Lua script code (including /sc prefix)
                 description: Description of what the script does  
-                parameters_json: JSON string of parameters (optional)
+                parameters: The script's placeholders with their descriptions (empty if none)
             
             Returns:
                 Status message
             """
-            return self.save_lua_script(script_name, lua_code, description, parameters_json)
+            return await self.save_lua_script_async(script_name, lua_code, description,
+                                                    {parameter.name: parameter.description for parameter in parameters})
         
         def list_available_scripts_tool() -> str:
             """
@@ -171,7 +328,7 @@ After generating the parameterized Lua code, use save_generated_lua_script to sa
                 JSON string of scripts list
             """
             scripts_list = self.get_available_scripts_list()
-            return json.dumps(scripts_list, indent=2)
+            return _json_dumps(scripts_list)
         
         def get_script_info_tool(script_name: str) -> str:
             """
@@ -184,28 +341,31 @@ After generating the parameterized Lua code, use save_generated_lua_script to sa
                 JSON string with script information
             """
             if not self.tool_manager:
-                return json.dumps({"error": "Tool manager not available"})
+                return _json_dumps({"error": "Tool manager not available"})
                 
             tools_info = self.tool_manager.list_tools()
             tools = tools_info.get("tools", {})
             
             if script_name not in tools:
-                return json.dumps({"error": f"Script '{script_name}' not found"})
+                return _json_dumps({"error": f"Script '{script_name}' not found"})
                 
-            return json.dumps(tools[script_name], indent=2)
+            return _json_dumps(tools[script_name])
         
-        def update_script_tool(script_name: str, updates_json: str) -> str:
+        def update_script_tool(script_name: str, updates: List[MetadataUpdate]) -> str:
             """
             Update an existing script
             
             Args:
                 script_name: Name of the script to update
-                updates_json: JSON string of updates
+                updates: Metadata fields to change; values of non-string fields (such as parameters or tags) are given as JSON
                 
             Returns:
                 Status message
             """
-            return self.update_script(script_name, updates_json)
+            current = self.tool_manager.list_tools()["tools"].get(script_name, {}).get("metadata", {}) if self.tool_manager else {}
+            return self.update_script(script_name, {
+                update.key: _decode_update_value(update.value, current.get(update.key)) for update in updates
+            })
         
         def remove_script_tool(script_name: str) -> str:
             """
@@ -235,7 +395,7 @@ After generating the parameterized Lua code, use save_generated_lua_script to sa
             ],
         )
     
-    def save_lua_script(self, script_name: str, lua_code: str, description: str, parameters_json: str = "{}", version: str = "1.0.0") -> str:
+    def save_lua_script(self, script_name: str, lua_code: str, description: str, parameters: Union[Dict[str, str], str, None] = None, version: str = "1.0.0") -> str:
         """
         Save a generated Lua script using the UnifiedToolManager
         
@@ -243,17 +403,19 @@ After generating the parameterized Lua code, use save_generated_lua_script to sa
             script_name: Name for the script
             lua_code: The complete Lua script code (including /sc prefix)
             description: Description of what the script does  
-            parameters_json: JSON string of parameters (optional)
+            parameters: Parameter specifications (name -> description), or the same as a JSON string (optional)
             version: Version of the script
         Returns:
             Status message indicating success or failure
         """
         try:
-            # Parse parameters from JSON
-            try:
-                parameters = json.loads(parameters_json) if parameters_json else {}
-            except json.JSONDecodeError:
-                return f"Invalid parameters JSON format: {parameters_json}"
+            # Parameters normally arrive as a dict; JSON strings are still accepted
+            if isinstance(parameters, str):
+                try:
+                    parameters = _json_loads(parameters) if parameters else {}
+                except json.JSONDecodeError:
+                    return f"Invalid parameters JSON format: {parameters}"
+            parameters = parameters or {}
             
             # Validate the generated script
             validation_result = self.validate_lua_code(lua_code)
@@ -268,23 +430,28 @@ After generating the parameterized Lua code, use save_generated_lua_script to sa
             if script_name in existing_tools.get("tools", {}):
                 return f"Script '{script_name}' already exists. Use update_script_tool to modify it."
             
-            # Save files locally
-            script_file = self.tools_dir / f"{script_name}.lua"
-            with open(script_file, 'w') as f:
-                f.write(lua_code)
+            # One timestamp for the wrapper header and the registry entry
+            created_at = datetime.now().isoformat()
             
-            # Generate Python wrapper
-            python_wrapper = self.generate_python_wrapper(script_name, description, parameters, lua_code)
+            # Generate and compile the Python wrapper first: if it does not compile, no file is written
+            python_wrapper = self.generate_python_wrapper(script_name, description, parameters, lua_code, version, created_at)
             wrapper_file = self.tools_dir / f"{script_name}.py"
-            with open(wrapper_file, 'w') as f:
-                f.write(python_wrapper)
+            script_file = self.tools_dir / f"{script_name}.lua"
+            try:
+                _write_module_atomic(wrapper_file, python_wrapper)
+                _write_text_atomic(script_file, lua_code)
+            except (OSError, py_compile.PyCompileError):
+                # Never leave the files of a script that is not registered
+                wrapper_file.unlink(missing_ok=True)
+                script_file.unlink(missing_ok=True)
+                raise
             
             # Register with tool manager
             tool_metadata = {
                 'description': description,
                 'parameters': parameters,
                 'api_requirements': [],
-                'created_at': datetime.now().isoformat(),
+                'created_at': created_at,
                 'version': version,
                 'lua_file_path': str(script_file),
                 'python_file_path': str(wrapper_file),
@@ -292,19 +459,34 @@ After generating the parameterized Lua code, use save_generated_lua_script to sa
             
             # Save to unified registry through tool manager
             self.tool_manager.register_generated_tool(script_name, tool_metadata)
+            self.saved_scripts.append(script_name)
             
-            self.logger.info(f"Successfully saved Lua script: {script_name}")
+            self.logger.info("Successfully saved Lua script: %s", script_name)
             return f"Successfully saved Factorio Lua script '{script_name}' with Python wrapper to {script_file}"
             
         except Exception as e:
-            self.logger.error(f"Failed to save script {script_name}: {e}")
+            self.logger.error("Failed to save script %s: %s", script_name, e)
             return f"Failed to save script: {str(e)}"
     
+    async def save_lua_script_async(self, script_name: str, lua_code: str, description: str, parameters: Union[Dict[str, str], str, None] = None, version: str = "1.0.0") -> str:
+        """
+        Async variant of save_lua_script() for callers on the event loop: the Lua validation,
+        file writes and wrapper compilation run in a worker thread instead of blocking the loop
+        
+        Args:
+            See save_lua_script()
+        Returns:
+            Status message indicating success or failure
+        """
+        return await asyncio.to_thread(self.save_lua_script, script_name, lua_code, description, parameters, version)
+    
     def generate_python_wrapper(self, 
                                 script_name: str,
                                 description: str,
                                 parameters: Dict[str, str],
-                                lua_script: str) -> str:
+                                lua_script: str,
+                                version: str = "1.0.0",
+                                generated_at: Optional[str] = None) -> str:
         """
         Generate Python wrapper for the parameterized Lua script
         
@@ -313,132 +495,70 @@ After generating the parameterized Lua code, use save_generated_lua_script to sa
             description: Script description
             parameters: Parameter specifications (name -> description)
             lua_script: The Lua script template with placeholders
+            version: Version recorded in the script metadata
+            generated_at: ISO timestamp recorded in the wrapper (defaults to now)
         Returns:
             Generated Python wrapper code
         """
+        # Parameter names in declaration order, shared by every generated snippet below
+        param_names = list(parameters)
         
         # Generate parameter list for function signature
-        param_list = ", ".join([f"{name}: str" for name in parameters.keys()])
+        param_list = ", ".join([f"{name}: str" for name in param_names])
         
         # Generate parameter documentation
         param_docs = "\n".join([f"        {name}: {desc}" 
                                for name, desc in parameters.items()])   
         
-        # Generate parameter replacement code
-        param_replacement_code = ""
+        # Specialize the template for the declared parameters: their {name} placeholders become
+        # str.format fields and every other brace (Lua tables) is escaped, so a call is one format()
         if parameters:
-            param_replacement_code = """
-        # Replace parameters in the Lua script template
-        script_to_execute = lua_script_template"""
-            
-            for param_name in parameters.keys():
-                param_replacement_code += f"""
-        script_to_execute = script_to_execute.replace("{{{param_name}}}", str({param_name}))"""
+            # The same pass counts the placeholders for the metadata
+            template, placeholder_count = _format_template(lua_script, parameters)
+            format_args = ", ".join([f"{name}={name}" for name in param_names])
+            # Rendered scripts are cached by argument values, since agents often repeat a call
+            render_code = f"""
+@functools.lru_cache(maxsize=128)
+def _render({", ".join(param_names)}) -> str:
+    \"\"\"Fill the parameters into the Lua script template\"\"\"
+    return _TEMPLATE.format({format_args})
+"""
+            render_args = ", ".join([f"str({name})" for name in param_names])
+            param_replacement_code = f"""
+        # Fill the parameters into the Lua script template (cached per argument values)
+        script_to_execute = _render({render_args})
+        """
+            script_expr = "script_to_execute"
         else:
-            param_replacement_code = """
-        # No parameters to replace
-        script_to_execute = lua_script_template"""
+            # Fast path: the template is the script, sent as-is
+            template = lua_script
+            placeholder_count = 0
+            render_code = ""
+            param_replacement_code = ""
+            script_expr = "_TEMPLATE"
                 
         # Build the parameter dict for the result
-        param_dict_str = ", ".join([f'"{name}": {name}' for name in parameters.keys()])
-        
-        # Escape the lua script for inclusion in Python string
-        escaped_lua_script = lua_script.replace('"""', '"'*3).replace('\\', '\\\\')
+        param_dict_str = ", ".join([f'"{name}": {name}' for name in param_names])
         
-        # Count placeholders for metadata
-        placeholder_count = len([p for p in lua_script.split('{') if '}' in p])
+        # repr() yields a valid Python literal for any script, quotes and backslashes included
+        template_literal = repr(template)
         
         # Generate wrapper code
-        wrapper_template = '''"""
-{description}
-
-This is a dynamically generated Python wrapper for a parameterized Factorio Lua script.
-Generated at: {timestamp}
-"""
-from typing import Dict, Any
-from api.factorio_interface import FactorioInterface
-import toml
-
-# Global variables for lazy loading
-_factorio_interface = None
-_config = None
-
-def get_factorio_interface(description: str = ""):
-    """Get the factorio interface instance, creating it if necessary"""
-    global _factorio_interface, _config
-    
-    if _factorio_interface is None:
-        if _config is None:
-            _config = toml.load("config/config.toml")
-        _factorio_interface = FactorioInterface(
-            _config["rcon"]["host"], 
-            _config["rcon"]["port"], 
-            _config["rcon"]["password"],
-            message=description
-        )
-    
-    return _factorio_interface
-
-def {script_name}({param_list}) -> Dict[str, Any]:
-    """
-    {description}
-    
-    Args:{param_docs}
-        
-    Returns:
-        Dict containing operation results and status information
-    """
-    try:
-        # The Lua script template with placeholders
-        lua_script_template = """{escaped_lua_script}"""
-        {param_replacement_code}
-        
-        # Execute the parameterized Lua script via RCON
-        factorio = get_factorio_interface(description="{description}")
-        output = factorio._send_command(script_to_execute)
-        
-        result = {{
-            "executed": True,
-            "output": output,
-            "script_name": "{script_name}",
-            "parameters": {{{param_dict_str}}},
-        }}
-        
-        return result
-        
-    except Exception as e:
-        return {{
-            "executed": False,
-            "message": f"Script execution failed: {{str(e)}}",
-            "error": str(e),
-            "script_name": "{script_name}",
-            "parameters": {{{param_dict_str}}}
-        }}
-
-
-# Script metadata for registry
-SCRIPT_METADATA = {{
-    "name": "{script_name}",
-    "description": "{description}",
-    "parameters": {parameters_json},
-    "placeholder_count": {placeholder_count},
-    "version": "{version}"
-}}
-'''.format(
-            description=description,
-            timestamp=datetime.now().isoformat(),
-            script_name=script_name,
-            param_list=param_list,
-            param_docs=param_docs if param_docs else "\n        No parameters required",
-            escaped_lua_script=escaped_lua_script,
-            param_replacement_code=param_replacement_code,
-            param_dict_str=param_dict_str,
-            parameters_json=json.dumps(parameters),
-            placeholder_count=placeholder_count,
-            version=version
-        )
-        
-        return wrapper_template
+        return _WRAPPER_TEMPLATE.format_map({
+            "description": description,
+            "timestamp": generated_at or datetime.now().isoformat(),
+            "script_name": script_name,
+            "param_list": param_list,
+            "param_docs": param_docs if param_docs else "\n        No parameters required",
+            "template_literal": template_literal,
+            "render_code": render_code,
+            "param_replacement_code": param_replacement_code,
+            "script_expr": script_expr,
+            "param_dict_str": param_dict_str,
+            "parameters_json": json.dumps(parameters),
+            "placeholder_count": placeholder_count,
+            "version": version,
+        })
     
     def validate_lua_code(self, lua_code: str) -> Dict[str, Any]:
         """
@@ -463,13 +583,13 @@ SCRIPT_METADATA = {{
                 clean_code = clean_code[3:].strip()
             
             if self.lua_runtime:
-                try:
-                    # Try to load the code (doesn't execute, just parses)
-                    self.lua_runtime.eval(f"function() {clean_code} end")
+                # Compile the code as a chunk (doesn't execute, just parses); repeated scripts hit the cache
+                error = _lua_syntax_error(self.lua_runtime, clean_code)
+                if error is None:
                     self.logger.info("Lua syntax validation passed")
-                except Exception as e:
+                else:
                     validation_result["valid"] = False
-                    validation_result["errors"].append(f"Lua syntax error: {str(e)}")
+                    validation_result["errors"].append(f"Lua syntax error: {error}")
             else:
                 validation_result["warnings"].append("Lua runtime not available, skipping syntax validation")
             
@@ -493,28 +613,44 @@ SCRIPT_METADATA = {{
         tools_info = self.tool_manager.list_tools()
         tools = tools_info.get("tools", {})
         
-        scripts_list = []
-        for tool_name, tool_info in tools.items():
-            provider_result = tool_info.get("provider_result", {})
-            script_info = provider_result.get("script_info", {})
-            
-            scripts_list.append({
-                'name': tool_name,
-                'description': tool_info.get("metadata", {}).get("description", ""),
-                'version': tool_info.get("metadata", {}).get("version", "1.0.0"),
-                'created_at': tool_info.get("created_at", ""),
-                'api_requirements': tool_info.get("metadata", {}).get("api_requirements", [])
-            })
+        return [self._script_summary(tool_name, tool_info) for tool_name, tool_info in tools.items()]
+    
+    def get_script_summary(self, script_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the summary of a single script, as listed by get_available_scripts_list()
         
-        return scripts_list
+        Args:
+            script_name: Name of the script
+            
+        Returns:
+            Script information dictionary, or None if the script is not registered
+        """
+        if not self.tool_manager:
+            return None
+        tool_info = self.tool_manager.list_tools().get("tools", {}).get(script_name)
+        if tool_info is None:
+            return None
+        return self._script_summary(script_name, tool_info)
+    
+    @staticmethod
+    def _script_summary(tool_name: str, tool_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize a registry entry for the script listings"""
+        metadata = tool_info.get("metadata", {})
+        return {
+            'name': tool_name,
+            'description': metadata.get("description", ""),
+            'version': metadata.get("version", "1.0.0"),
+            'created_at': tool_info.get("created_at", ""),
+            'api_requirements': metadata.get("api_requirements", [])
+        }
     
-    def update_script(self, script_name: str, updates_json: str) -> str:
+    def update_script(self, script_name: str, updates: Union[Dict[str, Any], str]) -> str:
         """
         Update an existing script through the tool manager
         
         Args:
             script_name: Name of the script to update
-            updates_json: JSON string of updates to apply
+            updates: Updates to apply, or the same as a JSON string
             
         Returns:
             Status message
@@ -523,15 +659,16 @@ SCRIPT_METADATA = {{
             return "Tool manager not available"
             
         try:
-            # Parse updates from JSON
-            try:
-                updates = json.loads(updates_json)
-            except json.JSONDecodeError:
-                return f"Invalid updates JSON format: {updates_json}"
+            # Updates normally arrive as a dict; JSON strings are still accepted
+            if isinstance(updates, str):
+                try:
+                    updates = _json_loads(updates)
+                except json.JSONDecodeError:
+                    return f"Invalid updates JSON format: {updates}"
             
             # Delegate to tool manager
             result = self.tool_manager.update_tool_metadata(script_name, updates)
-            return json.dumps(result)
+            return _json_dumps(result)
             
         except Exception as e:
             return f"Failed to update script '{script_name}': {str(e)}"
@@ -551,7 +688,7 @@ SCRIPT_METADATA = {{
             
         try:
             result = self.tool_manager.remove_tool(script_name)
-            return json.dumps(result)
+            return _json_dumps(result)
             
         except Exception as e:
             return f"Failed to remove script '{script_name}': {str(e)}"
@@ -560,22 +697,33 @@ SCRIPT_METADATA = {{
         """Run the coding agent in interactive mode"""
         self.logger.info("Starting Factorio Lua Coding Agent in interactive mode")
         try:
-            await Runner.run(self.agent, input)
+            await Runner.run(self.agent, input, run_config=self.run_config)
             
         except KeyboardInterrupt:
             self.logger.info("Coding Agent stopped by user")
         except Exception as e:
-            self.logger.error(f"Error in coding agent: {e}", exc_info=True)
+            self.logger.error("Error in coding agent: %s", e, exc_info=True)
         finally:
             self.logger.info("Coding Agent stopped")
 
+# Global instance
+_coding_agent = None
+
+def get_coding_agent() -> CodingAgent:
+    """Get the global coding agent instance, creating it on first use"""
+    global _coding_agent
+    if _coding_agent is None:
+        _coding_agent = CodingAgent()
+    return _coding_agent
+
 async def main():
     """Main function for running the coding agent"""
-    coding_agent = CodingAgent()
+    coding_agent = get_coding_agent()
     input_str = input("Enter your input: ")
     await coding_agent.run_interactive(input_str)
 
 
 if __name__ == "__main__":
+    from langsmith.wrappers import OpenAIAgentsTracingProcessor
     set_trace_processors([OpenAIAgentsTracingProcessor()])
     asyncio.run(main())
\ No newline at end of file
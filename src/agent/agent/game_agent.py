@@ -1,13 +1,27 @@
 import logging
 import os
-import toml
 import asyncio
 import json
-from typing import Dict, List, Any, Optional, Callable
+import textwrap
+from typing import Dict, List, Any, Optional, Callable, Tuple
 from pathlib import Path
+try:
+    import orjson
+    _json_loads = orjson.loads
 
-from agents import Agent, Runner, set_default_openai_key, function_tool, set_trace_processors, ModelSettings
+    def _json_dumps(data: Any) -> str:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS, default=str).decode()
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(data: Any) -> str:
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
+
+from agents import Agent, AgentsException, Runner, set_default_openai_key, function_tool, set_trace_processors, ModelSettings
+from factorio_rcon import RCONBaseError
+from openai import OpenAIError
 from langsmith.wrappers import OpenAIAgentsTracingProcessor
+from utils.log_queue import configure_queue_logging
 from agent.tool.agent_tools import (
     get_player_position,
     move_player,
@@ -17,20 +31,19 @@ from agent.tool.agent_tools import (
     insert_item,
     remove_item,
     get_inventory,
-    query_wiki_knowledge_base
+    get_snapshot,
+    query_wiki_knowledge_base,
+    get_config,
+    get_factorio_interface
 )
-from agent.agent.coding_agent import CodingAgent
+from agent.agent.coding_agent import get_coding_agent
 from agent.tool.unified_tool_manager import get_unified_tool_manager, LuaScriptProvider
 
-config = toml.load("config/config.toml")
+config = get_config()
 set_default_openai_key(config["openai"]["OPENAI_API_KEY"])
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    filename='factorio_agent.log'
-)
+configure_queue_logging('factorio_agent.log', level=logging.INFO)
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.StreamHandler())
 
@@ -40,6 +53,27 @@ os.environ["LANGSMITH_API_KEY"] = config["langsmith"]["api_key"]
 os.environ["LANGSMITH_PROJECT"] = config["langsmith"]["project"]
 
 
+# Game API tools shared by every master agent; the tool management tools are bound per instance
+_BASE_TOOLS = (
+    get_player_position,
+    move_player,
+    search_entities,
+    place_entity,
+    remove_entity,
+    insert_item,
+    remove_item,
+    get_inventory,
+    get_snapshot,
+    query_wiki_knowledge_base
+)
+_MODEL_SETTINGS = ModelSettings(parallel_tool_calls=True)
+
+# Fixed manage_tools error responses, serialized once
+_MISSING_REQUIREMENT = _json_dumps({"success": False, "message": "Please provide tool requirement description"})
+_MISSING_EXECUTE_TOOL_NAME = _json_dumps({"success": False, "message": "Please provide the tool name to execute"})
+_MISSING_REMOVE_TOOL_NAME = _json_dumps({"success": False, "message": "Please provide the tool name to remove"})
+
+
 class MainGameAgent:
     """
     Main game agent - use unified tool manager to manage dynamic tools
@@ -49,9 +83,11 @@ class MainGameAgent:
         self.logger = logging.getLogger('main_game_agent')
         
         self.tool_manager = get_unified_tool_manager()
+        # (tools_version, JSON) of the last "list" response, reused until the registry changes
+        self._tools_list_cache: Optional[Tuple[int, str]] = None
         
         # Initialize CodingAgent and register as tool provider
-        self.coding_agent = CodingAgent()
+        self.coding_agent = get_coding_agent()
         lua_provider = LuaScriptProvider(self.coding_agent)
         self.tool_manager.register_provider(lua_provider)
         self.tool_manager.load_all_tools()
@@ -60,30 +96,16 @@ class MainGameAgent:
         self.agent = self._create_agent()
     
     def _create_agent(self) -> Agent:
-        # Base tools
-        base_tools = [
-            get_player_position,
-            move_player,
-            search_entities,
-            place_entity,
-            remove_entity,
-            insert_item,
-            remove_item,
-            get_inventory,
-            query_wiki_knowledge_base
-        ]
-        
         tool_management_tools = [
-            self._create_unified_tool_interface()
+            self._create_unified_tool_interface(),
+            self._create_fetch_output_tool()
         ]
         
-        all_tools = base_tools + tool_management_tools
+        all_tools = [*_BASE_TOOLS, *tool_management_tools]
 
-        # Get current available dynamic tools list
-        current_tools = self.tool_manager.list_tools()
-        available_tools_list = list(current_tools.get("tools", {}).keys())
-        
-        instructions = f"""
+        # Kept byte-identical across runs so the provider's prompt prefix cache stays valid;
+        # the changing list of dynamic tools is sent in each run's input instead
+        instructions = """
 You are a professional Factorio game player and interact with the game using API tools, with dynamic action tool generation.
 
 Workflow:
@@ -104,8 +126,9 @@ Use manage_tools interface for all tool operations:
 - action="list": List all available tools
 - action="execute": Execute a specific tool
 - action="remove": Remove a tool
+Large execution results are returned as a preview with a result_ref; read the rest with fetch_tool_output.
 
-Currently available dynamic tools: {available_tools_list}
+The currently available dynamic tools are listed in each message.
 
 Maintain autonomy and manage your own status and decision-making process step by step without waiting for additional instructions.
 """
@@ -116,10 +139,17 @@ Maintain autonomy and manage your own status and decision-making process step by
             instructions=instructions,
             tools=all_tools,
             model=config["openai"]["MODEL"],
-            model_settings=ModelSettings(parallel_tool_calls=True)
+            model_settings=_MODEL_SETTINGS
         )
     
     def _create_unified_tool_interface(self):
+        # Action name -> handler; every handler takes all manage_tools arguments as keywords
+        handlers = {
+            "create": self._create_action,
+            "list": self._list_action,
+            "execute": self._execute_action,
+            "remove": self._remove_action,
+        }
 
         @function_tool
         async def manage_tools(action: str, 
@@ -142,56 +172,104 @@ Maintain autonomy and manage your own status and decision-making process step by
             Returns:
                 JSON string of operation result
             """
+            handler = handlers.get(action)
+            if handler is None:
+                return _json_dumps({
+                    "success": False, 
+                    "message": f"Unsupported action: {action}",
+                    "supported_actions": list(handlers)
+                })
             try:
-                if action == "create":
-                    if not requirement:
-                        return json.dumps({"success": False, "message": "Please provide tool requirement description"})
-                    
-                    result = await self.tool_manager.create_tool(
-                        requirement=requirement,
-                        functionality_details=functionality_details,
-                        suggested_name=suggested_name
-                    )
-                    return json.dumps(result, indent=2, ensure_ascii=False)
-                
-                elif action == "list":
-                    result = self.tool_manager.list_tools()
-                    return json.dumps(result, indent=2, ensure_ascii=False)
-                
-                elif action == "execute":
-                    if not tool_name:
-                        return json.dumps({"success": False, "message": "Please provide the tool name to execute"})
-                    
-                    try:
-                        parameters = json.loads(parameters_json) if parameters_json else {}
-                    except json.JSONDecodeError:
-                        return json.dumps({"success": False, "message": f"Parameter JSON format error: {parameters_json}"})
-                    
-                    result = self.tool_manager.execute_tool(tool_name, parameters)
-                    return json.dumps(result, indent=2, ensure_ascii=False)
-                
-                elif action == "remove":
-                    if not tool_name:
-                        return json.dumps({"success": False, "message": "Please provide the tool name to remove"})
-                    
-                    result = self.tool_manager.remove_tool(tool_name)
-                    return json.dumps(result, indent=2, ensure_ascii=False)
-                
-                else:
-                    return json.dumps({
-                        "success": False, 
-                        "message": f"Unsupported action: {action}",
-                        "supported_actions": ["create", "list", "execute", "remove"]
-                    })
-                    
+                return await handler(tool_name=tool_name, requirement=requirement,
+                                     functionality_details=functionality_details,
+                                     suggested_name=suggested_name, parameters_json=parameters_json)
             except Exception as e:
-                return json.dumps({
+                return _json_dumps({
                     "success": False,
                     "message": f"Tool management error: {str(e)}",
                     "error": str(e)
-                }, ensure_ascii=False)
+                })
         
         return manage_tools
+    
+    def _create_fetch_output_tool(self):
+
+        @function_tool
+        def fetch_tool_output(result_ref: str, offset: int = 0) -> str:
+            """
+            Read a large dynamic tool result that manage_tools returned as a preview with a result_ref
+            
+            Args:
+                result_ref: the result_ref from the execute response
+                offset: character offset to read from (the next_offset of the previous read)
+                
+            Returns:
+                JSON string with the content chunk and the next_offset (null when complete)
+            """
+            return _json_dumps(self.tool_manager.read_tool_output(result_ref, offset))
+        
+        return fetch_tool_output
+    
+    async def _create_action(self, requirement: str, functionality_details: str, suggested_name: str, **_) -> str:
+        """manage_tools action="create": generate a new tool"""
+        if not requirement:
+            return _MISSING_REQUIREMENT
+        result = await self.tool_manager.create_tool(
+            requirement=requirement,
+            functionality_details=functionality_details,
+            suggested_name=suggested_name
+        )
+        return _json_dumps(result)
+    
+    async def _list_action(self, **_) -> str:
+        """manage_tools action="list": the registry, re-serialized only after it changed"""
+        version = self.tool_manager.tools_version
+        if self._tools_list_cache is None or self._tools_list_cache[0] != version:
+            self._tools_list_cache = (version, _json_dumps(self.tool_manager.list_tools()))
+        return self._tools_list_cache[1]
+    
+    async def _execute_action(self, tool_name: str, parameters_json: str, **_) -> str:
+        """manage_tools action="execute": run a tool with JSON parameters"""
+        if not tool_name:
+            return _MISSING_EXECUTE_TOOL_NAME
+        try:
+            # Calls without parameters skip the parser
+            parameters = {} if parameters_json in ("", "{}") else _json_loads(parameters_json)
+        except json.JSONDecodeError:
+            return _json_dumps({"success": False, "message": f"Parameter JSON format error: {parameters_json}"})
+        result = await self.tool_manager.execute_tool_async(tool_name, parameters)
+        return _json_dumps(result)
+    
+    async def _remove_action(self, tool_name: str, **_) -> str:
+        """manage_tools action="remove": delete a tool"""
+        if not tool_name:
+            return _MISSING_REMOVE_TOOL_NAME
+        return _json_dumps(self.tool_manager.remove_tool(tool_name))
+    
+    def available_tool_names(self) -> List[str]:
+        """Names of the currently available dynamic tools"""
+        return list(self.tool_manager.list_tools().get("tools", {}))
+
+
+# Prompts sent to the master agent, dedented once at import; {tools} is filled in per run
+_INITIAL_MSG = textwrap.dedent("""
+    The world is now loaded and ready to play.
+    Please start:
+    1. Check current available tools with action="list"
+    2. Create some new action tools if needed with action="create"
+    3. Test the new tools with action="execute"
+    4. Get current game state
+    5. Develop long-term strategy and goals
+    Currently available dynamic tools: {tools}
+    """).strip()
+
+_STEP_MSG = textwrap.dedent("""
+    Please continue executing your plan.
+    1. Get the latest game state
+    2. Decide the next step based on your long-term goals and previous action results
+    3. If you need new features, use manage_tools interface to create them
+    Currently available dynamic tools: {tools}
+    """).strip()
 
 
 async def main():
@@ -199,45 +277,46 @@ async def main():
     logger.info("Starting Factorio master agent")
     
     master_agent = MainGameAgent()
+
+    # Connect the RCON pool before the first tool call and keep it warm between steps
+    factorio = get_factorio_interface()
+    await factorio.pool.warmup()
+    keepalive_task = asyncio.create_task(factorio.pool.keepalive(config["rcon"].get("keepalive_interval", 60)))
     
     try:
-        initial_message = """
-        The world is now loaded and ready to play. 
-        Please start:
-        1. Check current available tools with action="list" 
-        2. Create some new action tools if needed with action="create"
-        3. Test the new tools with action="execute"
-        4. Get current game state
-        5. Develop long-term strategy and goals
-        """
-        
-        result = await Runner.run(master_agent.agent, initial_message, max_turns=100)
-        logger.info(f"Agent response: {result.final_output}")
+        result = await Runner.run(master_agent.agent, _INITIAL_MSG.format(tools=master_agent.available_tool_names()), max_turns=100)
+        logger.info("Agent response: %s", result.final_output)
 
         step_count = 0
         max_steps = config["agent"].get("max_steps", 100)
         step_delay = config["agent"].get("step_delay", 5)
         
+        # Steps start on a fixed cadence: time spent in the previous step counts towards the delay
+        clock = asyncio.get_running_loop().time
+        deadline = clock()
         while step_count < max_steps:
-            await asyncio.sleep(step_delay)
+            deadline = max(deadline + step_delay, clock())
+            delay = deadline - clock()
+            if delay > 0:
+                await asyncio.sleep(delay)
 
-            message = """
-            Please continue executing your plan.
-            1. Get the latest game state
-            2. Decide the next step based on your long-term goals and previous action results
-            3. If you need new features, use manage_tools interface to create them
-        """
-
-            result = await Runner.run(master_agent.agent, message, max_turns=100)
-            logger.info(f"Step {step_count + 1} - Agent response: {result.final_output}")
+            try:
+                result = await Runner.run(master_agent.agent, _STEP_MSG.format(tools=master_agent.available_tool_names()), max_turns=100)
+            except (AgentsException, OpenAIError) as e:
+                # A failed step (turn limit, model or API error) is logged and the run goes on
+                logger.error("Step %d failed: %s", step_count + 1, e)
+            else:
+                logger.info("Step %d - Agent response: %s", step_count + 1, result.final_output)
             
             step_count += 1
 
     except KeyboardInterrupt:
         logger.info("User stopped the agent")
-    except Exception as e:
-        logger.error(f"Main loop error: {e}", exc_info=True)
+    except (AgentsException, OpenAIError, RCONBaseError) as e:
+        # Only runtime failures are handled here; programming errors propagate
+        logger.error("Main loop error: %s", e, exc_info=True)
     finally:
+        keepalive_task.cancel()
         logger.info("Master agent stopped")
 
 
@@ -0,0 +1,54 @@
+"""
+Agent Runtime Module
+
+Process-wide shared state: the parsed configuration and the FactorioInterface.
+Agent tools and the generated script wrappers both get them from here, so the
+config is parsed once and every caller shares one RCON connection and pool.
+"""
+
+import functools
+import threading
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+from api.factorio_interface import FactorioInterface
+try:
+    import tomllib
+except ImportError:
+    import tomli as tomllib
+
+def _freeze(value: Any) -> Any:
+    """Read-only copy of a parsed TOML value: tables become mapping proxies, arrays tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+@functools.cache
+def get_config(config_path: str = "config/config.toml") -> Mapping[str, Any]:
+    """
+    Load the config file (config/config.toml by default) once per process.
+
+    Every caller shares the returned mapping, so it is read-only.
+    """
+    with open(config_path, "rb") as f:
+        return _freeze(tomllib.load(f))
+
+_factorio_interface: Optional[FactorioInterface] = None
+_factorio_interface_lock = threading.Lock()
+
+def get_factorio_interface() -> FactorioInterface:
+    """Get the shared factorio interface instance, creating it on first use"""
+    global _factorio_interface
+    if _factorio_interface is None:
+        # Wrappers may run in worker threads; only one of them may open the RCON connection
+        with _factorio_interface_lock:
+            if _factorio_interface is None:
+                config = get_config()
+                _factorio_interface = FactorioInterface(
+                    config["rcon"]["host"], 
+                    config["rcon"]["port"], 
+                    config["rcon"]["password"],
+                    pool_size=config["rcon"].get("pool_size", 4)
+                )
+    return _factorio_interface
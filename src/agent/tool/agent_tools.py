@@ -7,29 +7,9 @@ with the Factorio game through the FactorioInterface.
 
 from typing import List, Dict, Any, Optional, Union, Tuple
 from agents import function_tool
-from api.factorio_interface import FactorioInterface
-import toml
+from agent.runtime import get_config, get_factorio_interface
 from knowledge_base.processor.query_processor import QueryProcessor
 
-# Global variables for lazy loading
-_factorio_interface = None
-_config = None
-
-def get_factorio_interface():
-    """Get the factorio interface instance, creating it if necessary"""
-    global _factorio_interface, _config
-    
-    if _factorio_interface is None:
-        if _config is None:
-            _config = toml.load("config/config.toml")
-        _factorio_interface = FactorioInterface(
-            _config["rcon"]["host"], 
-            _config["rcon"]["port"], 
-            _config["rcon"]["password"]
-        )
-    
-    return _factorio_interface
-
 # @function_tool
 # def get_available_prototypes() -> Dict[str, List[str]]:
 #     """
@@ -41,7 +21,7 @@ def get_factorio_interface():
 #     return factorio.get_available_prototypes()
 
 @function_tool
-def get_player_position() -> Dict[str, float]:
+async def get_player_position() -> Dict[str, float]:
     """
     Get the player's current position in the game.
     
@@ -49,13 +29,13 @@ def get_player_position() -> Dict[str, float]:
         Dict with 'x' and 'y' coordinates
     """
     factorio = get_factorio_interface()
-    position = factorio.get_player_position()
+    position = await factorio.get_player_position_async()
     if position:
         return position
     return {"x": 0, "y": 0}  # Default if position cannot be determined
 
 @function_tool
-def move_player(x: float, y: float) -> str:
+async def move_player(x: float, y: float) -> str:
     """
     Move the player to a specific position.
     
@@ -67,16 +47,16 @@ def move_player(x: float, y: float) -> str:
         Status message
     """
     factorio = get_factorio_interface()
-    success = factorio.move_player(x, y)
+    success = await factorio.move_player_async(x, y)
     return "Player moved successfully" if success else "Failed to move player"
 
 @function_tool
-def search_entities(name: Optional[str] = None, 
+async def search_entities(name: Optional[str] = None, 
                  type: Optional[str] = None,
                  radius: Optional[float] = None,
                  position_x: Optional[float] = None,
                  position_y: Optional[float] = None,
-                 limit: Optional[int] = None) -> List[Dict[str, Any]]:
+                 limit: Optional[int] = 200) -> List[Dict[str, Any]]:
     """
     Search entities in the current game based on specified filters.
     
@@ -84,22 +64,15 @@ def search_entities(name: Optional[str] = None,
         name: Entity prototype name to filter by
         type: Entity type to filter by (make sure valid)
         radius: Radius of the search circle
-        position_x: X coordinate of the center of the search circle
-        position_y: Y coordinate of the center of the search circle
-        limit: Maximum number of entities to return
+        position_x: X coordinate of the center of the search circle (defaults to the player position)
+        position_y: Y coordinate of the center of the search circle (defaults to the player position)
+        limit: Maximum number of entities to return (default 200)
     Returns:
         List of entity data dictionaries
     """
     factorio = get_factorio_interface()
-    
-    # If position not specified, use player position
-    if radius and (position_x is None or position_y is None):
-        player_pos = factorio.get_player_position()
-        if player_pos:
-            position_x = position_x or player_pos.get('x', 0)
-            position_y = position_y or player_pos.get('y', 0)
-    
-    return factorio.search_entities(
+    # A missing center is filled in with the player position by the Lua command itself
+    return await factorio.search_entities_async(
         name=name, 
         type=type,
         position_x=position_x,
@@ -109,7 +82,7 @@ def search_entities(name: Optional[str] = None,
     )
 
 @function_tool
-def place_entity(name: str, x: float, y: float, direction: int) -> str:
+async def place_entity(name: str, x: float, y: float, direction: int) -> str:
     """
     Place an entity in the game.
     
@@ -125,11 +98,11 @@ def place_entity(name: str, x: float, y: float, direction: int) -> str:
     factorio = get_factorio_interface()
     if direction is None:
         direction = 0  # Default to North
-    success, message = factorio.place_entity(name, x, y, direction)
+    success, message = await factorio.place_entity_async(name, x, y, direction)
     return message
 
 @function_tool
-def remove_entity(name: str, x: float, y: float) -> str:
+async def remove_entity(name: str, x: float, y: float) -> str:
     """
     Remove an entity from the game.
     
@@ -142,11 +115,11 @@ def remove_entity(name: str, x: float, y: float) -> str:
         Status message
     """
     factorio = get_factorio_interface()
-    success, message = factorio.remove_entity(name, x, y)
+    success, message = await factorio.remove_entity_async(name, x, y)
     return message
 
 @function_tool
-def insert_item(item: str, count: int, 
+async def insert_item(item: str, count: int, 
                entity: str,
                inventory_type: Optional[str] = None,
                x: Optional[float] = None, 
@@ -169,11 +142,11 @@ def insert_item(item: str, count: int,
     # If entity is not specified, use "player"
     if entity is None:
         entity = "player"
-    success, message = factorio.insert_item(item, count, entity, inventory_type, x, y)
+    success, message = await factorio.insert_item_async(item, count, entity, inventory_type, x, y)
     return message
 
 @function_tool
-def remove_item(item: str, count: int, 
+async def remove_item(item: str, count: int, 
                entity: str ,
                x: Optional[float] = None, 
                y: Optional[float] = None) -> str:
@@ -194,11 +167,11 @@ def remove_item(item: str, count: int,
     # If entity is not specified, use "player"
     if entity is None:
         entity = "player"
-    success, message = factorio.remove_item(item, count, entity, x, y)
+    success, message = await factorio.remove_item_async(item, count, entity, x, y)
     return message
 
 @function_tool
-def get_inventory(entity: str,
+async def get_inventory(entity: str,
                  inventory_type: str = None,
                  x: Optional[float] = None, 
                  y: Optional[float] = None) -> Dict[str, int]:
@@ -218,7 +191,26 @@ def get_inventory(entity: str,
     # If entity is not specified, use "player"
     if entity is None:
         entity = "player"
-    return factorio.get_inventory(entity, inventory_type, x, y)
+    return await factorio.get_inventory_async(entity, inventory_type, x, y)
+
+@function_tool
+async def get_snapshot(inventory: bool = True,
+                       radius: Optional[float] = None,
+                       limit: Optional[int] = 200) -> Dict[str, Any]:
+    """
+    Get the player's position, inventory and nearby entities in a single call.
+    Prefer this over calling get_player_position, get_inventory and search_entities separately.
+    
+    Args:
+        inventory: Whether to include the player's main inventory contents
+        radius: If set, include entities within this radius of the player
+        limit: Maximum number of entities to return (default 200)
+        
+    Returns:
+        Dict with 'position', and optionally 'inventory' and 'entities'
+    """
+    factorio = get_factorio_interface()
+    return await factorio.get_snapshot_async(inventory=inventory, radius=radius, limit=limit)
 
 # @function_tool
 def list_supported_entities(mode: str = "all", search_type: str = None, keyword: str = None) -> List[str]:
@@ -249,7 +241,7 @@ def list_supported_items() -> Dict[str, List[str]]:
     return factorio.list_supported_items()
 
 @function_tool
-def find_surface_tile(name: Optional[str] = None,
+async def find_surface_tile(name: Optional[str] = None,
                      position_x: Optional[float] = None,
                      position_y: Optional[float] = None,
                      radius: Optional[float] = None,
@@ -268,7 +260,7 @@ def find_surface_tile(name: Optional[str] = None,
         List of tile data dictionaries
     """
     factorio = get_factorio_interface()
-    return factorio.find_surface_tile(name, position_x, position_y, radius, limit=limit)
+    return await factorio.find_surface_tile_async(name, position_x, position_y, radius, limit=limit)
 
 @function_tool
 def query_api_knowledge_base(query: str, k: int = 5) -> List[Dict]:
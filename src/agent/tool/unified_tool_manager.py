@@ -10,14 +10,42 @@ Key Design Principles:
 - Extensible provider architecture for different tool types
 """
 
+import asyncio
+import atexit
 import json
 import logging
 import importlib.util
-from typing import Dict, List, Any, Optional, Callable
+import re
+import threading
+import uuid
+from collections import deque
+from typing import Deque, Dict, List, Any, Optional, Callable
 from pathlib import Path
 from datetime import datetime
 from abc import ABC, abstractmethod
 from agents import Runner
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(data: Any) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str)
+
+    def _json_dumps_compact(data: Any) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS, default=str)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(data: Any) -> bytes:
+        return json.dumps(data, indent=2, default=str).encode()
+
+    def _json_dumps_compact(data: Any) -> bytes:
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str).encode()
+
+# Reference of a spilled tool result, as returned by execute_tool() (a uuid4 hex)
+_RESULT_REF_RE = re.compile(r"[0-9a-f]{32}")
+# Number of characters of a spilled result returned inline as its preview
+_PREVIEW_LENGTH = 512
 
 class ToolProvider(ABC):
     """Abstract base class for tool providers"""
@@ -43,10 +71,8 @@ class LuaScriptProvider(ToolProvider):
     async def generate_tool(self, requirement: str, **kwargs) -> Dict[str, Any]:
         """Generate a new Lua script tool through CodingAgent"""
         try:
-            # Record existing scripts before generation
-            existing_scripts = self.coding_agent.get_available_scripts_list()
-            existing_count = len(existing_scripts)
-            existing_names = {script['name'] for script in existing_scripts}
+            # Scripts saved by the coding agent from here on were created by this run
+            saved_before = len(self.coding_agent.saved_scripts)
             
             request_message = f"""
 Generate a new Factorio Lua script tool based on:
@@ -57,33 +83,27 @@ suggested_name: {kwargs.get('suggested_name', 'auto_generated')}
             result = await Runner.run(
                 self.coding_agent.agent,
                 input=request_message,
-                max_turns=10
+                max_turns=10,
+                run_config=self.coding_agent.run_config
             )
             
             # Check if new scripts were generated
-            current_scripts = self.coding_agent.get_available_scripts_list()
-            current_count = len(current_scripts)
-            
-            if current_count <= existing_count:
+            new_names = self.coding_agent.saved_scripts[saved_before:]
+            if not new_names:
                 return {
                     "success": False,
                     "message": "No new tool generated",
                     "details": str(result.final_output)
                 }
             
-            # Find the newly generated script(s)
-            new_scripts = [script for script in current_scripts 
-                          if script['name'] not in existing_names]
-            
-            if not new_scripts:
+            # Get the latest generated script
+            latest_script = self.coding_agent.get_script_summary(new_names[-1])
+            if latest_script is None:
                 return {
                     "success": False,
-                    "message": "No new tool generated (no new script names found)",
+                    "message": "No new tool generated (the new script is no longer registered)",
                     "details": str(result.final_output)
                 }
-            
-            # Get the latest generated script
-            latest_script = max(new_scripts, key=lambda x: x.get('created_at', ''))
             return {
                 "success": True,
                 "tool_name": latest_script['name'],
@@ -115,20 +135,51 @@ class UnifiedToolManager:
     storage, loading, and metadata management.
     """
     
-    def __init__(self, tools_dir: str = "src/agent/tool/generated"):
+    def __init__(self, tools_dir: str = "src/agent/tool/generated", save_delay: float = 0.2,
+                 outputs_dir: Optional[str] = None, max_inline_bytes: int = 4096,
+                 max_stored_outputs: int = 100):
         self.tools_dir = Path(tools_dir)
         self.tools_dir.mkdir(parents=True, exist_ok=True)
         
+        # Tool results larger than max_inline_bytes are written to outputs_dir (by default
+        # tool_outputs/ next to the tools directory) and returned as a reference with a preview,
+        # so they don't flood the agent's context. References only mean something to the
+        # conversation that received them, so results from earlier runs are cleared here and
+        # at most max_stored_outputs results are kept
+        self.outputs_dir = Path(outputs_dir) if outputs_dir else self.tools_dir.parent / "tool_outputs"
+        self.max_inline_bytes = max_inline_bytes
+        self.max_stored_outputs = max_stored_outputs
+        self._stored_outputs: Deque[Path] = deque()
+        self._clear_outputs()
+        
         self.logger = logging.getLogger('unified_tool_manager')
         
         # Core data structures - single source of truth
         self.tools_registry: Dict[str, Dict[str, Any]] = {}
         self.loaded_tools: Dict[str, Callable] = {}
         self.tool_providers: Optional[ToolProvider] = None
+        # Bumped on every registry or loaded-tool change, so callers can cache views of list_tools()
+        self.tools_version = 0
+        # Guards tools_registry, loaded_tools, tools_version and _stored_outputs: scripts are
+        # registered and tools run in worker threads while the event loop lists and loads tools.
+        # Registry entries are replaced rather than updated in place, so a shallow copy is a
+        # consistent snapshot
+        self._registry_lock = threading.RLock()
         
         # Metadata file - unified storage
         self.metadata_file = self.tools_dir / "tool_metadata.json"
         self._load_metadata()
+        
+        # Registry changes are written after save_delay seconds, so a burst of
+        # mutations costs a single write; flush() writes pending changes immediately.
+        # Changes can come from worker threads, so _flush_lock guards the dirty flag and the
+        # pending timer, and _write_lock keeps concurrent flushes from writing out of order
+        self.save_delay = save_delay
+        self._dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        atexit.register(self.flush)
     
     def register_provider(self, provider: ToolProvider):
         """
@@ -143,30 +194,62 @@ class UnifiedToolManager:
         if hasattr(provider, 'coding_agent') and hasattr(provider.coding_agent, 'set_tool_manager'):
             provider.coding_agent.set_tool_manager(self)
             
-        self.logger.info(f"Registered tool provider: {type(provider).__name__}")
+        self.logger.info("Registered tool provider: %s", type(provider).__name__)
     
     def _load_metadata(self):
         """Load metadata"""
         if self.metadata_file.exists():
             try:
-                with open(self.metadata_file, 'r') as f:
-                    data = json.load(f)
-                    self.tools_registry = data.get('tools', {})
-                self.logger.info(f"Loaded {len(self.tools_registry)} tools from metadata")
+                data = _json_loads(self.metadata_file.read_bytes())
+                self.tools_registry = data.get('tools', {})
+                self.logger.info("Loaded %d tools from metadata", len(self.tools_registry))
             except Exception as e:
-                self.logger.warning(f"Failed to load metadata: {e}")
+                self.logger.warning("Failed to load metadata: %s", e)
     
     def _save_metadata(self):
         """Save metadata"""
         try:
+            with self._registry_lock:
+                tools = dict(self.tools_registry)
             data = {
-                'tools': self.tools_registry,
+                'tools': tools,
                 'last_updated': datetime.now().isoformat()
             }
-            with open(self.metadata_file, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            # Write to a temporary file and rename it over the old one, so an interrupted
+            # save never leaves a truncated metadata file behind
+            tmp_file = self.metadata_file.with_suffix(".json.tmp")
+            tmp_file.write_bytes(_json_dumps(data))
+            tmp_file.replace(self.metadata_file)
         except Exception as e:
-            self.logger.error(f"Failed to save metadata: {e}")
+            self.logger.error("Failed to save metadata: %s", e)
+    
+    def _mark_dirty(self):
+        """
+        Schedule a metadata save, coalescing with one that is already pending.
+        Called with _registry_lock held, right after the registry change.
+        """
+        with self._flush_lock:
+            self.tools_version += 1
+            self._dirty = True
+            if self._flush_timer is not None:
+                return
+            # The save runs on a timer thread, never on the event loop
+            timer = threading.Timer(self.save_delay, self.flush)
+            timer.daemon = True
+            self._flush_timer = timer
+            timer.start()
+    
+    def flush(self):
+        """Write pending metadata changes to disk now"""
+        with self._write_lock:
+            with self._flush_lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                if not self._dirty:
+                    return
+                self._dirty = False
+            self._save_metadata()
     
     async def create_tool(self, 
                          requirement: str, 
@@ -196,7 +279,7 @@ class UnifiedToolManager:
             
             # Register to unified registry - this will be called by CodingAgent
             # via register_generated_tool method
-            self.logger.info(f"Tool generation initiated for: {tool_name}")
+            self.logger.info("Tool generation initiated for: %s", tool_name)
             
             # Try to hot load if the tool was successfully generated
             if self._hot_load_tool(tool_name):
@@ -219,7 +302,7 @@ class UnifiedToolManager:
         """
         try:
             # Store in unified registry
-            self.tools_registry[tool_name] = {
+            entry = {
                 # "requirement": metadata.get('description', ''),
                 # "created_at": metadata.get('created_at', datetime.now().isoformat()),
                 # "provider_result": {
@@ -229,13 +312,14 @@ class UnifiedToolManager:
                 # },
                 "metadata": metadata
             }
-            
-            self._save_metadata()
-            self.logger.info(f"Successfully registered generated tool: {tool_name}")
+            with self._registry_lock:
+                self.tools_registry[tool_name] = entry
+                self._mark_dirty()
+            self.logger.info("Successfully registered generated tool: %s", tool_name)
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to register generated tool {tool_name}: {e}")
+            self.logger.error("Failed to register generated tool %s: %s", tool_name, e)
             return False
     
     def update_tool_metadata(self, tool_name: str, updates: Dict[str, Any]) -> Dict[str, Any]:
@@ -249,42 +333,42 @@ class UnifiedToolManager:
         Returns:
             Dictionary with update results
         """
-        if tool_name not in self.tools_registry:
-            return {
-                "success": False,
-                "message": f"Tool '{tool_name}' not found"
-            }
-        
-        try:
-            # Update metadata
-            current_metadata = self.tools_registry[tool_name].get("metadata", {})
-            current_metadata.update(updates)
-            current_metadata['updated_at'] = datetime.now().isoformat()
-            
-            # Increment version
-            current_version = current_metadata.get('version', '1.0.0')
-            version_parts = current_version.split('.')
-            version_parts[-1] = str(int(version_parts[-1]) + 1)
-            new_version = '.'.join(version_parts)
-            current_metadata['version'] = new_version
-            
-            # Update registry
-            self.tools_registry[tool_name]["metadata"] = current_metadata
-            
-            self._save_metadata()
-            
-            return {
-                "success": True,
-                "message": f"Successfully updated tool '{tool_name}' to version {new_version}",
-                "new_version": new_version
-            }
+        with self._registry_lock:
+            if tool_name not in self.tools_registry:
+                return {
+                    "success": False,
+                    "message": f"Tool '{tool_name}' not found"
+                }
             
-        except Exception as e:
-            return {
-                "success": False,
-                "message": f"Failed to update tool '{tool_name}': {str(e)}",
-                "error": str(e)
-            }
+            try:
+                # Update a copy of the metadata, so snapshots taken by other threads stay intact
+                current_metadata = {**self.tools_registry[tool_name].get("metadata", {}), **updates}
+                current_metadata['updated_at'] = datetime.now().isoformat()
+                
+                # Increment version
+                current_version = current_metadata.get('version', '1.0.0')
+                version_parts = current_version.split('.')
+                version_parts[-1] = str(int(version_parts[-1]) + 1)
+                new_version = '.'.join(version_parts)
+                current_metadata['version'] = new_version
+                
+                # Update registry
+                self.tools_registry[tool_name] = {**self.tools_registry[tool_name], "metadata": current_metadata}
+                
+                self._mark_dirty()
+                
+                return {
+                    "success": True,
+                    "message": f"Successfully updated tool '{tool_name}' to version {new_version}",
+                    "new_version": new_version
+                }
+                
+            except Exception as e:
+                return {
+                    "success": False,
+                    "message": f"Failed to update tool '{tool_name}': {str(e)}",
+                    "error": str(e)
+                }
     
     def _hot_load_tool(self, tool_name: str) -> bool:
         """
@@ -310,12 +394,14 @@ class UnifiedToolManager:
             
             if hasattr(module, tool_name):
                 tool_func = getattr(module, tool_name)
-                self.loaded_tools[tool_name] = tool_func
-                self.logger.info(f"Hot loaded tool: {tool_name}")
+                with self._registry_lock:
+                    self.loaded_tools[tool_name] = tool_func
+                    self.tools_version += 1
+                self.logger.info("Hot loaded tool: %s", tool_name)
                 return True
                 
         except Exception as e:
-            self.logger.error(f"Failed to hot load tool {tool_name}: {e}")
+            self.logger.error("Failed to hot load tool %s: %s", tool_name, e)
         
         return False
     
@@ -328,12 +414,15 @@ class UnifiedToolManager:
         """
         loaded_count = 0
         
-        for tool_name in self.tools_registry.keys():
+        with self._registry_lock:
+            tool_names = list(self.tools_registry)
+        for tool_name in tool_names:
             if self._hot_load_tool(tool_name):
                 loaded_count += 1
         
-        self.logger.info(f"Loaded {loaded_count} tools")
-        return self.loaded_tools.copy()
+        self.logger.info("Loaded %d tools", loaded_count)
+        with self._registry_lock:
+            return self.loaded_tools.copy()
     
     def get_tool(self, tool_name: str) -> Optional[Callable]:
         """
@@ -362,7 +451,10 @@ class UnifiedToolManager:
         Returns:
             Dictionary with execution results
         """
-        tool_func = self.get_tool(tool_name)
+        return self._run_tool(tool_name, self.get_tool(tool_name), parameters)
+    
+    def _run_tool(self, tool_name: str, tool_func: Optional[Callable], parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Call a loaded tool and build the execute_tool() response; touches no registry state"""
         if not tool_func:
             return {
                 "success": False,
@@ -374,7 +466,7 @@ class UnifiedToolManager:
             return {
                 "success": True,
                 "message": f"Successfully executed tool: {tool_name}",
-                "result": result,
+                **self._inline_or_spill(result),
                 "parameters": parameters
             }
         except Exception as e:
@@ -384,6 +476,79 @@ class UnifiedToolManager:
                 "error": str(e)
             }
     
+    def _clear_outputs(self):
+        """Delete tool results stored by earlier runs"""
+        if self.outputs_dir.is_dir():
+            for path in self.outputs_dir.glob("*.json"):
+                path.unlink(missing_ok=True)
+    
+    def _inline_or_spill(self, result: Any) -> Dict[str, Any]:
+        """Return a small result inline; write a large one to outputs_dir and return a reference to it"""
+        serialized = _json_dumps_compact(result)
+        if len(serialized) <= self.max_inline_bytes:
+            return {"result": result}
+        text = serialized.decode("utf-8")
+        ref = uuid.uuid4().hex
+        path = self.outputs_dir / f"{ref}.json"
+        self.outputs_dir.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(serialized)
+        # Called from worker threads: record and evict under the lock, so concurrent calls
+        # neither evict the same file nor leave more than max_stored_outputs behind
+        with self._registry_lock:
+            self._stored_outputs.append(path)
+            while len(self._stored_outputs) > self.max_stored_outputs:
+                self._stored_outputs.popleft().unlink(missing_ok=True)
+        return {
+            "result_ref": ref,
+            "total_length": len(text),
+            "preview": text[:_PREVIEW_LENGTH],
+        }
+    
+    def read_tool_output(self, ref: str, offset: int = 0, length: int = 4096) -> Dict[str, Any]:
+        """
+        Read part of a tool result that execute_tool() stored instead of returning it inline
+        
+        Args:
+            ref: The result_ref returned by execute_tool()
+            offset: Character offset to start reading at
+            length: Maximum number of characters to return
+            
+        Returns:
+            Dictionary with the content chunk and the offset to continue from (None at the end)
+        """
+        if not _RESULT_REF_RE.fullmatch(ref):
+            return {"success": False, "message": f"Invalid result reference: {ref}"}
+        try:
+            text = (self.outputs_dir / f"{ref}.json").read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return {"success": False, "message": f"No stored result for reference: {ref}"}
+        offset = max(offset, 0)
+        content = text[offset:offset + length]
+        end = offset + len(content)
+        return {
+            "success": True,
+            "content": content,
+            "total_length": len(text),
+            "next_offset": end if end < len(text) else None,
+        }
+    
+    async def execute_tool_async(self, tool_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async variant of execute_tool() for callers on the event loop: generated tools make
+        blocking RCON calls, so they run in a worker thread and parallel tool calls can overlap.
+        The tool is looked up (and hot loaded if needed) here on the loop thread; only the call
+        itself runs in the worker thread
+        
+        Args:
+            tool_name: Name of the tool to execute
+            parameters: Parameters to pass to the tool
+            
+        Returns:
+            Dictionary with execution results
+        """
+        tool_func = self.get_tool(tool_name)
+        return await asyncio.to_thread(self._run_tool, tool_name, tool_func, parameters)
+    
     def list_tools(self) -> Dict[str, Any]:
         """
         List all available tools and their metadata
@@ -391,12 +556,13 @@ class UnifiedToolManager:
         Returns:
             Dictionary with tools information
         """
-        return {
-            "total_count": len(self.tools_registry),
-            "loaded_count": len(self.loaded_tools),
-            "tools": self.tools_registry,
-            "loaded_tools": list(self.loaded_tools.keys()),
-        }
+        with self._registry_lock:
+            return {
+                "total_count": len(self.tools_registry),
+                "loaded_count": len(self.loaded_tools),
+                "tools": dict(self.tools_registry),
+                "loaded_tools": list(self.loaded_tools.keys()),
+            }
     
     def remove_tool(self, tool_name: str) -> Dict[str, Any]:
         """
@@ -409,18 +575,16 @@ class UnifiedToolManager:
             Dictionary with removal results
         """
         try:
-            # Remove from memory
-            if tool_name in self.loaded_tools:
-                del self.loaded_tools[tool_name]
-            
-            # Get file paths before removing from registry
-            tool_info = self.tools_registry.get(tool_name, {})
-            metadata = tool_info.get("metadata", {})
-            
-            # Remove from registry
-            if tool_name in self.tools_registry:
-                del self.tools_registry[tool_name]
-                self._save_metadata()
+            with self._registry_lock:
+                # Remove from memory
+                if self.loaded_tools.pop(tool_name, None) is not None:
+                    self.tools_version += 1
+                
+                # Remove from registry, keeping the entry for its file paths
+                tool_info = self.tools_registry.pop(tool_name, None)
+                if tool_info is not None:
+                    self._mark_dirty()
+            metadata = (tool_info or {}).get("metadata", {})
             
             # Delete files
             files_deleted = []
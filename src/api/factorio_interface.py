@@ -6,16 +6,76 @@ through RCON. It wraps the base API commands and handles the RCON connection,
 command execution, and response parsing.
 """
 
+import asyncio
+import functools
 import json
 import logging
-from typing import Optional, List, Dict, Any, Union, Tuple
+import math
+import re
+import threading
+import weakref
+from typing import Optional, List, Dict, Any, Union, Tuple, Callable
 import factorio_rcon as rcon
-from api.sandbox.base import FactorioAPI
-from api.prototype import get_entity_names, get_item_names, is_valid_entity, is_valid_item
+from api.sandbox import entity as entity_api, inventory as inventory_api, player as player_api, state as state_api, surface as surface_api
+from api.rcon_pool import RconPool, set_socket_options
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+from api.prototype import get_entity_names, get_item_names, get_entity_by_type, get_entity_info, get_entity_names_by_lower, is_valid_entity, is_valid_item
 
 # Configure logging
 logger = logging.getLogger('factorio_interface')
 
+# Default cap on entities returned by a search, enforced on the server side
+DEFAULT_SEARCH_LIMIT = 200
+
+# Valid entity directions: 0, 4, 8, 12 mean north, east, south, west
+_VALID_DIRECTIONS = frozenset((0, 4, 8, 12))
+
+# Factorio maps are limited to 1,000,000 tiles from the origin in each direction
+_MAP_LIMIT = 1_000_000
+# Number of response characters included in log messages
+_LOG_RESPONSE_LIMIT = 200
+
+# Names interpolated into Lua source: prototype, entity, inventory-type and tile names
+_LUA_NAME_RE = re.compile(r"\A[a-z0-9_-]{1,64}\Z")
+
+@functools.lru_cache(maxsize=1024)
+def _is_lua_safe_name(name: str) -> bool:
+    """Check a name against the Lua name whitelist, memoized per string."""
+    return _LUA_NAME_RE.match(name) is not None
+
+# Fallback for positions printed as a Lua table: {x = 123.45, y = 678.90}
+_POSITION_RE = re.compile(r"([xy])\s*=\s*(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)")
+
+@functools.lru_cache(maxsize=128)
+def _match_supported_entities(mode: str, search_type: Optional[str], keyword: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Cached core of FactorioInterface.list_supported_entities (prototype data is static).
+    Returns the matching entity names as a tuple, so callers cannot alter the cached value,
+    or None if the search parameters are invalid.
+    """
+    # Get all entities by default
+    if mode == "all":
+        return get_entity_names()
+
+    # Filter by specific type
+    if mode == "type" and search_type:
+        return tuple(get_entity_by_type(search_type))
+
+    # Search by keyword
+    if mode == "search" and keyword:
+        # Use fuzzy matching algorithm - fuzzywuzzy
+        from fuzzywuzzy import fuzz
+        keyword = keyword.lower()
+        return tuple(name for lower_name, name in get_entity_names_by_lower().items()
+                     if fuzz.partial_ratio(keyword, lower_name) > 70)
+
+    return None
+
 class FactorioInterface:
     """
     High-level interface for interacting with a Factorio server through RCON.
@@ -23,7 +83,7 @@ class FactorioInterface:
     and response parsing.
     """
     
-    def __init__(self, host: str = "127.0.0.1", port: int = 8088, password: str = "lvshrd", message: str = "Hello, World!"):
+    def __init__(self, host: str = "127.0.0.1", port: int = 8088, password: str = "lvshrd", message: str = "Hello, World!", pool_size: int = 4):
         """
         Initialize the Factorio interface.
         
@@ -31,14 +91,82 @@ class FactorioInterface:
             host: RCON server hostname or IP address
             port: RCON server port
             password: RCON password
+            pool_size: Number of pooled connections used by the async methods
         """
-        self.rcon_client = rcon.RCONClient(host, port, password)
-        self.api = FactorioAPI()
+        self.host = host
+        self.port = port
+        self.password = password
+        # Long-lived RCON connection, opened lazily and reused across commands
+        self._client: Optional[rcon.RCONClient] = None
+        # Serializes commands on the shared connection when called from several threads
+        self._client_lock = threading.RLock()
+        # Async connection pools, one per event loop, created on first async call there
+        self.pool_size = pool_size
+        self._pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, RconPool]" = weakref.WeakKeyDictionary()
         self._send_command(f"/sc game.print('{message}')")
+
+    def __enter__(self) -> "FactorioInterface":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _get_client(self) -> rcon.RCONClient:
+        """
+        Get the persistent RCON client, connecting it on first use and again after it failed.
+        
+        Returns:
+            rcon.RCONClient: A connected RCON client
+        """
+        if self._client is not None and (self._client.rcon_socket is None or self._client.rcon_failure):
+            self.close()
+        if self._client is None:
+            client = rcon.RCONClient(self.host, self.port, self.password, connect_on_init=False)
+            client.connect()
+            set_socket_options(client)
+            self._client = client
+        return self._client
+
+    def close(self) -> None:
+        """Close the persistent RCON connection if it is open."""
+        with self._client_lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
     
     def _send_command(self, command: str) -> str:
         """
         Send a command to the Factorio server and return the response.
+        The connection is reused between calls. A command that fails on a dropped connection
+        is not resent, since the server may already have run it; the error is raised and the
+        next command reconnects.
+        
+        Args:
+            command: The command to send
+            
+        Returns:
+            str: The server response
+        """
+        with self._client_lock:
+            response = self._get_client().send_command(command)
+        return response if response else ""
+
+    @property
+    def pool(self) -> RconPool:
+        """
+        The asyncio RCON connection pool of the running event loop.
+        asyncio primitives are bound to the loop they are used on, so each loop gets its own pool.
+        """
+        loop = asyncio.get_running_loop()
+        pool = self._pools.get(loop)
+        if pool is None:
+            pool = RconPool(self.host, self.port, self.password, size=self.pool_size)
+            self._pools[loop] = pool
+        return pool
+
+    async def _send_command_async(self, command: str) -> str:
+        """
+        Send a command over a pooled connection so independent calls can run concurrently.
         
         Args:
             command: The command to send
@@ -46,9 +174,95 @@ class FactorioInterface:
         Returns:
             str: The server response
         """
-        with self.rcon_client as client:
-            response = client.send_command(command)
-            return response if response else ""
+        return await self.pool.send_command(command)
+
+    async def send_batched(self, command: str) -> str:
+        """
+        Send a command through the pool's batching layer. Commands issued concurrently
+        within a few milliseconds share one RCON round-trip.
+        
+        Args:
+            command: The command to send
+            
+        Returns:
+            str: The server response
+        """
+        return await self.pool.submit(command)
+
+    def _check_entity_names(self, name: Optional[Union[str, List[str]]]) -> Optional[str]:
+        """
+        Validate entity prototype name(s) before a command is sent.
+        
+        Args:
+            name: Entity prototype name(s) to validate
+            
+        Returns:
+            Optional[str]: A failure message, or None if all names are valid
+        """
+        if name:
+            if isinstance(name, list):
+                for entity_name in name:
+                    if not is_valid_entity(entity_name):
+                        return f"Failed: Invalid entity name: {entity_name}"
+            elif not is_valid_entity(name):
+                return f"Failed: Invalid entity name: {name}"
+        return None
+    
+    def _check_lua_names(self, *names: Optional[Union[str, List[str]]]) -> Optional[str]:
+        """
+        Check that names interpolated into a Lua command only contain safe characters.
+        
+        Args:
+            names: Names or lists of names; None values are skipped
+            
+        Returns:
+            Optional[str]: A failure message, or None if all names are safe
+        """
+        for name in names:
+            for value in (name if isinstance(name, list) else (name,)):
+                if value is not None and not (isinstance(value, str) and _is_lua_safe_name(value)):
+                    return f"Failed: Invalid name: {value!r}"
+        return None
+
+    def _check_position(self, x: float, y: float) -> Optional[str]:
+        """
+        Check that a position is numeric and inside the map bounds.
+        
+        Args:
+            x: The x coordinate
+            y: The y coordinate
+            
+        Returns:
+            Optional[str]: A failure message, or None if the position is valid
+        """
+        try:
+            if abs(x) <= _MAP_LIMIT and abs(y) <= _MAP_LIMIT:
+                return None
+        except TypeError:
+            pass
+        return f"Failed: Invalid position ({x}, {y})"
+
+    def _check_optional_position(self, x: Optional[float], y: Optional[float]) -> Optional[str]:
+        """Like _check_position(), but a position that is left out entirely (both None) is accepted."""
+        if x is None and y is None:
+            return None
+        return self._check_position(x, y)
+
+    def _check_amounts(self, **amounts: Optional[float]) -> Optional[str]:
+        """
+        Check that counts, radii and limits interpolated into a Lua command are positive real numbers.
+        
+        Args:
+            amounts: Values by argument name; None values are skipped
+            
+        Returns:
+            Optional[str]: A failure message, or None if all values are valid
+        """
+        for key, value in amounts.items():
+            if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))
+                                      or not 0 < value < math.inf):
+                return f"Failed: Invalid {key}: {value!r}"
+        return None
     
     def _parse_json_response(self, response: str) -> Union[Dict, List, None]:
         """
@@ -65,12 +279,35 @@ class FactorioInterface:
             
         try:
             # Try to parse as JSON
-            return json.loads(response)
+            return _json_loads(response)
         except json.JSONDecodeError:
             # If it's not valid JSON, return the original string
-            logger.warning(f"Failed to parse response as JSON: {response}")
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning("Failed to parse response as JSON: %s", response[:_LOG_RESPONSE_LIMIT])
             return None
     
+    def _parse_entity_columns(self, columns: Any) -> List[Dict[str, Any]]:
+        """
+        Rebuild a list of entity dictionaries from the columnar search response.
+        
+        Args:
+            columns: Parsed response of the form {"name": [...], "x": [...], "y": [...], ...}
+            
+        Returns:
+            List[Dict[str, Any]]: List of entity data dictionaries
+        """
+        if not isinstance(columns, dict) or "name" not in columns:
+            return columns if columns else []
+        entities = []
+        for name, x, y, direction, status, entity_type in zip(
+                columns["name"], columns["x"], columns["y"],
+                columns["direction"], columns["status"], columns["type"]):
+            entity = {"name": name, "position": {"x": x, "y": y}, "direction": direction, "type": entity_type}
+            if status:
+                entity["status"] = status
+            entities.append(entity)
+        return entities
+
     def _parse_success_response(self, response: str) -> Tuple[bool, str]:
         """
         Parse a success/failure response from the Factorio server.
@@ -91,50 +328,135 @@ class FactorioInterface:
         else:
             return True, response
     
+    # Each operation is split into _build_<op>(), which validates the arguments and renders
+    # the Lua command, and _parse_<op>() for the response; the sync and async methods only
+    # differ in how the command is sent.
+    def _call(self, request: Tuple[Optional[str], Any], parse: Callable[[str], Any]) -> Any:
+        """
+        Send a built command on the persistent connection and parse the response.
+
+        Args:
+            request: (command, None), or (None, result) if the arguments were rejected
+            parse: Parser for the server response
+
+        Returns:
+            The parsed response, or the rejection result without sending anything
+        """
+        command, rejected = request
+        if command is None:
+            return rejected
+        return parse(self._send_command(command))
+
+    async def _call_async(self, request: Tuple[Optional[str], Any], parse: Callable[[str], Any],
+                          batched: bool = False) -> Any:
+        """
+        Async version of _call(): send the command over the connection pool.
+
+        Args:
+            request: (command, None), or (None, result) if the arguments were rejected
+            parse: Parser for the server response
+            batched: Send through the batching layer (for read-only commands)
+
+        Returns:
+            The parsed response, or the rejection result without sending anything
+        """
+        command, rejected = request
+        if command is None:
+            return rejected
+        if batched:
+            return parse(await self.send_batched(command))
+        return parse(await self._send_command_async(command))
+
     # Player-related methods
+    def _build_get_player_position(self) -> Tuple[Optional[str], Any]:
+        return player_api.get_player_position(), None
+
+    def _parse_position_response(self, response: str) -> Optional[Dict[str, float]]:
+        """
+        Parse a position response from the Factorio server.
+
+        Args:
+            response: The response string from the server
+
+        Returns:
+            Optional[Dict[str, float]]: A dictionary with 'x' and 'y' coordinates or None if parsing fails
+        """
+        # Response format is JSON: {"x":123.45,"y":678.90}
+        if not response:
+            return None
+        try:
+            position = _json_loads(response)
+        except json.JSONDecodeError:
+            position = {key: float(value) for key, value in _POSITION_RE.findall(response)}
+        if isinstance(position, dict) and "x" in position and "y" in position:
+            return {"x": float(position["x"]), "y": float(position["y"])}
+        logger.error("Error parsing position response: %s", response[:_LOG_RESPONSE_LIMIT])
+        return None
+
     def get_player_position(self) -> Optional[Dict[str, float]]:
         """
         Get the player's current position.
-        
+
         Returns:
             Optional[Dict[str, float]]: A dictionary with 'x' and 'y' coordinates or None if failed
         """
-        command = self.api.Player.get_player_position()
-        response = self._send_command(command)
-        
-        # Response format is typically: {x = 123.45, y = 678.90}
-        if response:
-            try:
-                # Extract x and y values using string manipulation
-                response = response.strip("{}")
-                parts = response.split(",")
-                position = {}
-                for part in parts:
-                    key, value = part.split("=")
-                    position[key.strip()] = float(value.strip())
-                return position
-            except Exception as e:
-                logger.error(f"Error parsing position response: {e}")
-        
-        return None
-    
+        return self._call(self._build_get_player_position(), self._parse_position_response)
+
+    async def get_player_position_async(self) -> Optional[Dict[str, float]]:
+        """Async version of get_player_position()."""
+        return await self._call_async(self._build_get_player_position(), self._parse_position_response, batched=True)
+
+    def _build_move_player(self, x: float, y: float) -> Tuple[Optional[str], Any]:
+        if self._check_position(x, y):
+            return None, False
+        return player_api.move_to(x, y), None
+
+    def _parse_move_response(self, response: str) -> bool:
+        return bool(response) or response == ""
+
     def move_player(self, x: float, y: float) -> bool:
         """
         Move the player to a specific position.
-        
+
         Args:
             x: The x coordinate
             y: The y coordinate
-            
+
         Returns:
             bool: True if successful, False otherwise
         """
-        command = self.api.Player.move_to(x, y)
-        response = self._send_command(command)
-        return bool(response) or response == ""
-    
+        return self._call(self._build_move_player(x, y), self._parse_move_response)
+
+    async def move_player_async(self, x: float, y: float) -> bool:
+        """Async version of move_player()."""
+        return await self._call_async(self._build_move_player(x, y), self._parse_move_response)
+
     # Entity-related methods
-    def search_entities(self, 
+    def _build_search_entities(self, name, type, position_x, position_y, radius,
+                               bottom_left_x, bottom_left_y, top_right_x, top_right_y,
+                               limit) -> Tuple[Optional[str], Any]:
+        error = (self._check_entity_names(name) or self._check_lua_names(type)
+                 or self._check_optional_position(position_x, position_y)
+                 or self._check_optional_position(bottom_left_x, bottom_left_y)
+                 or self._check_optional_position(top_right_x, top_right_y)
+                 or self._check_amounts(radius=radius, limit=limit))
+        if error:
+            return None, {"error": error}
+        return entity_api.search_entities(
+            name=name, type=type,
+            position_x=position_x, position_y=position_y, radius=radius,
+            bottom_left_x=bottom_left_x, bottom_left_y=bottom_left_y,
+            top_right_x=top_right_x, top_right_y=top_right_y,
+            limit=limit
+        ), None
+
+    def _parse_search_response(self, response: str, as_columns: bool = False) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        entities = self._parse_json_response(response)
+        if as_columns:
+            return entities if entities else {}
+        return self._parse_entity_columns(entities)
+
+    def search_entities(self,
                     name: Optional[Union[str, List[str]]] = None,
                     type: Optional[str] = None,
                     position_x: Optional[float] = None,
@@ -144,88 +466,119 @@ class FactorioInterface:
                     bottom_left_y: Optional[float] = None,
                     top_right_x: Optional[float] = None,
                     top_right_y: Optional[float] = None,
-                    limit: Optional[int] = None) -> List[Dict[str, Any]]:
+                    limit: Optional[int] = DEFAULT_SEARCH_LIMIT,
+                    as_columns: bool = False) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
         """
         Search entities in the current game based on specified filters.
-        
+
         Args:
             name: Entity prototype name(s) to filter by
             type: Entity type to filter by
-            position_x: X coordinate of the center of the search circle
-            position_y: Y coordinate of the center of the search circle
+            position_x: X coordinate of the center of the search circle (defaults to the player position)
+            position_y: Y coordinate of the center of the search circle (defaults to the player position)
             radius: Radius of the search circle
             bottom_left_x: Bottom-left X coordinate of the search area
             bottom_left_y: Bottom-left Y coordinate of the search area
             top_right_x: Top-right X coordinate of the search area
             top_right_y: Top-right Y coordinate of the search area
-            limit: Maximum number of entities to return
-            
+            limit: Maximum number of entities to return (capped on the server side)
+            as_columns: Return the raw columnar data {"name": [...], "x": [...], ...} instead of a list of dictionaries
+
         Returns:
-            List[Dict[str, Any]]: List of entity data dictionaries
+            List[Dict[str, Any]]: List of entity data dictionaries, or {"error": message} if a name is invalid
         """
-        if name:
-            if isinstance(name, list):
-                for entity_name in name:
-                    if not is_valid_entity(entity_name):
-                        return f"Failed: Invalid entity name: {entity_name}"
-            elif not is_valid_entity(name):
-                return f"Failed: Invalid entity name: {name}"
-        command = self.api.Entity.search_entities(
-            name=name, type=type, 
-            position_x=position_x, position_y=position_y, radius=radius,
-            bottom_left_x=bottom_left_x, bottom_left_y=bottom_left_y,
-            top_right_x=top_right_x, top_right_y=top_right_y,
-            limit=limit
-        )
-        response = self._send_command(command)
-        entities = self._parse_json_response(response)
-        return entities if entities else []
-    
+        request = self._build_search_entities(name, type, position_x, position_y, radius,
+                                              bottom_left_x, bottom_left_y, top_right_x, top_right_y, limit)
+        return self._call(request, functools.partial(self._parse_search_response, as_columns=as_columns))
+
+    async def search_entities_async(self,
+                    name: Optional[Union[str, List[str]]] = None,
+                    type: Optional[str] = None,
+                    position_x: Optional[float] = None,
+                    position_y: Optional[float] = None,
+                    radius: Optional[float] = None,
+                    bottom_left_x: Optional[float] = None,
+                    bottom_left_y: Optional[float] = None,
+                    top_right_x: Optional[float] = None,
+                    top_right_y: Optional[float] = None,
+                    limit: Optional[int] = DEFAULT_SEARCH_LIMIT,
+                    as_columns: bool = False) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        """Async version of search_entities()."""
+        request = self._build_search_entities(name, type, position_x, position_y, radius,
+                                              bottom_left_x, bottom_left_y, top_right_x, top_right_y, limit)
+        return await self._call_async(request, functools.partial(self._parse_search_response, as_columns=as_columns),
+                                      batched=True)
+
+    def _build_place_entity(self, name: str, x: float, y: float, direction: int) -> Tuple[Optional[str], Any]:
+        if direction not in _VALID_DIRECTIONS:
+            return None, (False, f"Failed: Invalid direction {direction}, must be one of 0, 4, 8, 12")
+        error = self._check_position(x, y) or self._check_entity_names(name)
+        if error:
+            return None, (False, error)
+        return entity_api.place_entity(name, x, y, direction), None
+
     def place_entity(self, name: str, x: float, y: float, direction: int = 0) -> Tuple[bool, str]:
         """
         Place an entity in the game surface.
-        
+
         Args:
             name: The entity prototype name to create
             x: The x coordinate
             y: The y coordinate
             direction: The direction (0, 4, 8, 12 for N, E, S, W)
-            
+
         Returns:
             Tuple[bool, str]: (success, message)
         """
-        if name:
-            if not is_valid_entity(name):
-                return f"Failed: Invalid entity name: {name}"
-        command = self.api.Entity.place_entity(name, x, y, direction)
-        response = self._send_command(command)
-        return self._parse_success_response(response)
-    
+        return self._call(self._build_place_entity(name, x, y, direction), self._parse_success_response)
+
+    async def place_entity_async(self, name: str, x: float, y: float, direction: int = 0) -> Tuple[bool, str]:
+        """Async version of place_entity()."""
+        return await self._call_async(self._build_place_entity(name, x, y, direction), self._parse_success_response)
+
+    def _build_remove_entity(self, name: str, x: float, y: float) -> Tuple[Optional[str], Any]:
+        error = self._check_lua_names(name) or self._check_position(x, y)
+        if error:
+            return None, (False, error)
+        return entity_api.remove_entity(name, x, y), None
+
     def remove_entity(self, name: str, x: float, y: float) -> Tuple[bool, str]:
         """
         Remove an entity from the game surface.
-        
+
         Args:
             name: The entity prototype name to remove
             x: The x coordinate
             y: The y coordinate
-            
+
         Returns:
             Tuple[bool, str]: (success, message)
         """
-        command = self.api.Entity.remove_entity(name, x, y)
-        response = self._send_command(command)
-        return self._parse_success_response(response)
-    
+        return self._call(self._build_remove_entity(name, x, y), self._parse_success_response)
+
+    async def remove_entity_async(self, name: str, x: float, y: float) -> Tuple[bool, str]:
+        """Async version of remove_entity()."""
+        return await self._call_async(self._build_remove_entity(name, x, y), self._parse_success_response)
+
     # Inventory-related methods
-    def insert_item(self, item: str, count: int, 
-                   entity: str = "player", 
-                   inventory_type: str = None, 
-                   x: Optional[float] = None, 
+    def _build_insert_item(self, item: str, count: int, entity: str, inventory_type: Optional[str],
+                           x: Optional[float], y: Optional[float]) -> Tuple[Optional[str], Any]:
+        # if not is_valid_item(item):
+        #     return None, (False, f"Invalid item name: {item}")
+        error = (self._check_lua_names(item, entity, inventory_type) or self._check_amounts(count=count)
+                 or self._check_optional_position(x, y))
+        if error:
+            return None, (False, error)
+        return inventory_api.insert_item(item, count, entity, inventory_type, x, y), None
+
+    def insert_item(self, item: str, count: int,
+                   entity: str = "player",
+                   inventory_type: str = None,
+                   x: Optional[float] = None,
                    y: Optional[float] = None) -> Tuple[bool, str]:
         """
         Insert items into an inventory.
-        
+
         Args:
             item: The item name to insert
             count: The count of the item
@@ -233,61 +586,124 @@ class FactorioInterface:
             entity: The name of the entity to insert into
             x: The x coordinate of the entity (if not player)
             y: The y coordinate of the entity (if not player)
-            
+
         Returns:
             Tuple[bool, str]: (success, message)
         """
-        # if not is_valid_item(item):
-        #     return False, f"Invalid item name: {item}"
-            
-        command = self.api.Inventory.insert_item(item, count, entity, inventory_type, x, y)
-        response = self._send_command(command)
-        return self._parse_success_response(response)
-    
-    def remove_item(self, item: str, count: int, 
-                   entity: str = "player", 
-                   x: Optional[float] = None, 
+        request = self._build_insert_item(item, count, entity, inventory_type, x, y)
+        return self._call(request, self._parse_success_response)
+
+    async def insert_item_async(self, item: str, count: int,
+                   entity: str = "player",
+                   inventory_type: str = None,
+                   x: Optional[float] = None,
+                   y: Optional[float] = None) -> Tuple[bool, str]:
+        """Async version of insert_item()."""
+        request = self._build_insert_item(item, count, entity, inventory_type, x, y)
+        return await self._call_async(request, self._parse_success_response)
+
+    def _build_remove_item(self, item: str, count: int, entity: str,
+                           x: Optional[float], y: Optional[float]) -> Tuple[Optional[str], Any]:
+        if not is_valid_item(item):
+            return None, (False, f"Invalid item name: {item}")
+        error = (self._check_lua_names(item, entity) or self._check_amounts(count=count)
+                 or self._check_optional_position(x, y))
+        if error:
+            return None, (False, error)
+        return inventory_api.remove_item(item, count, entity, x, y), None
+
+    def remove_item(self, item: str, count: int,
+                   entity: str = "player",
+                   x: Optional[float] = None,
                    y: Optional[float] = None) -> Tuple[bool, str]:
         """
         Remove items from an inventory.
-        
+
         Args:
             item: The item name to remove
             count: The count of the item
             entity: The name of the entity to remove from
             x: The x coordinate of the entity (if not player)
             y: The y coordinate of the entity (if not player)
-            
+
         Returns:
             Tuple[bool, str]: (success, message)
         """
-        if not is_valid_item(item):
-            return False, f"Invalid item name: {item}"
-            
-        command = self.api.Inventory.remove_item(item, count, entity, x, y)
-        response = self._send_command(command)
-        return self._parse_success_response(response)
-    
-    def get_inventory(self, entity: str = "player", 
+        return self._call(self._build_remove_item(item, count, entity, x, y), self._parse_success_response)
+
+    async def remove_item_async(self, item: str, count: int,
+                   entity: str = "player",
+                   x: Optional[float] = None,
+                   y: Optional[float] = None) -> Tuple[bool, str]:
+        """Async version of remove_item()."""
+        return await self._call_async(self._build_remove_item(item, count, entity, x, y), self._parse_success_response)
+
+    def _build_get_inventory(self, entity: str, inventory_type: Optional[str],
+                             x: Optional[float], y: Optional[float]) -> Tuple[Optional[str], Any]:
+        error = self._check_lua_names(entity, inventory_type) or self._check_optional_position(x, y)
+        if error:
+            return None, {"error": error}
+        return inventory_api.get_inventory(entity, inventory_type, x, y), None
+
+    def _parse_inventory_response(self, response: str) -> Union[str, Dict[str, int]]:
+        # inventory = self._parse_json_response(response)
+        return response if response else {}
+
+    def get_inventory(self, entity: str = "player",
                      inventory_type: str = None,
-                     x: Optional[float] = None, 
+                     x: Optional[float] = None,
                      y: Optional[float] = None) -> Dict[str, int]:
         """
         Get inventory contents.
-        
+
         Args:
             entity: The name of the entity to get from
             inventory_type: The type of inventory to get (if not player, can query 'defines.inventory' from wiki knowledge base)
             x: The x coordinate of the entity (if not player)
             y: The y coordinate of the entity (if not player)
-            
+
         Returns:
             Dict[str, int]: Dictionary mapping item names to counts
         """
-        command = self.api.Inventory.get_inventory(entity, inventory_type, x, y)
-        response = self._send_command(command)
-        # inventory = self._parse_json_response(response)
-        return response if response else {}
+        return self._call(self._build_get_inventory(entity, inventory_type, x, y), self._parse_inventory_response)
+
+    async def get_inventory_async(self, entity: str = "player",
+                     inventory_type: str = None,
+                     x: Optional[float] = None,
+                     y: Optional[float] = None) -> Dict[str, int]:
+        """Async version of get_inventory()."""
+        return await self._call_async(self._build_get_inventory(entity, inventory_type, x, y),
+                                      self._parse_inventory_response, batched=True)
+
+    def _build_get_snapshot(self, position: bool, inventory: bool,
+                            radius: Optional[float], limit: Optional[int]) -> Tuple[Optional[str], Any]:
+        return state_api.get_snapshot(position, inventory, radius, limit), None
+
+    def _parse_snapshot_response(self, response: str) -> Dict[str, Any]:
+        snapshot = self._parse_json_response(response)
+        return snapshot if isinstance(snapshot, dict) else {}
+
+    def get_snapshot(self, position: bool = True, inventory: bool = True,
+                     radius: Optional[float] = None, limit: Optional[int] = DEFAULT_SEARCH_LIMIT) -> Dict[str, Any]:
+        """
+        Read player position, inventory and nearby entities in a single round-trip.
+
+        Args:
+            position: Whether to include the player's position
+            inventory: Whether to include the player's main inventory
+            radius: If set, include entities within this radius of the player
+            limit: Maximum number of entities to include (capped on the server side)
+
+        Returns:
+            Dict[str, Any]: Dictionary with the requested 'position', 'inventory' and 'entities' keys
+        """
+        return self._call(self._build_get_snapshot(position, inventory, radius, limit), self._parse_snapshot_response)
+
+    async def get_snapshot_async(self, position: bool = True, inventory: bool = True,
+                                 radius: Optional[float] = None, limit: Optional[int] = DEFAULT_SEARCH_LIMIT) -> Dict[str, Any]:
+        """Async version of get_snapshot()."""
+        return await self._call_async(self._build_get_snapshot(position, inventory, radius, limit),
+                                      self._parse_snapshot_response, batched=True)
 
     def list_supported_entities(self, mode: str = "all", search_type: str = None, keyword: str = None):
         """
@@ -302,40 +718,52 @@ class FactorioInterface:
         Returns:
             List of entity names or Dict containing matched entity names and their info
         """
-        from api.prototype import get_entity_names, get_entity_by_type, get_entity_info
-        
-        # Get all entities by default
+        names = _match_supported_entities(mode, search_type, keyword)
+        if names is None:
+            return {"error": "Invalid search parameters"}
         if mode == "all":
-            result = get_entity_names()
-                    
-        # Filter by specific type
-        elif mode == "type" and search_type:
-            entity_names = get_entity_by_type(search_type)
-            result = {name: get_entity_info(name) for name in entity_names}
-            
-        # Search by keyword
-        elif mode == "search" and keyword:
-            all_entities = get_entity_names()
-            result = {}
-            for name in all_entities:
-                # Use fuzzy matching algorithm - fuzzywuzzy
-                from fuzzywuzzy import fuzz
-                similarity = fuzz.partial_ratio(keyword.lower(), name.lower())
-                if similarity > 70:
-                    result[name] = get_entity_info(name)
-        else:
-            result = {"error": "Invalid search parameters"}
-            
-        return result
+            return names
+        return {name: get_entity_info(name) for name in names}
 
     def list_supported_items(self):
         """Get all supported items"""
-        from src.api.prototype import get_item_names, get_item_info
+        return get_item_names()
+
+    def get_available_prototypes(self) -> Dict[str, Tuple[str, ...]]:
+        """
+        Get the available prototype names. api.prototype builds the name tuples once
+        at import, so no per-instance copy is kept.
         
-        items = get_item_names()
-        return items
+        Returns:
+            Dict[str, Tuple[str, ...]]: Dictionary with keys 'entities' and 'items'
+        """
+        return {
+            "entities": get_entity_names(),
+            "items": get_item_names()
+        }
+
+    def reload_prototypes(self) -> None:
+        """Drop cached entity listings so they are rebuilt on next access."""
+        _match_supported_entities.cache_clear()
+
+    def _build_find_surface_tile(self, name, position_x, position_y, radius,
+                                 bottom_left_x, bottom_left_y, top_right_x, top_right_y,
+                                 limit) -> Tuple[Optional[str], Any]:
+        error = (self._check_lua_names(name)
+                 or self._check_optional_position(position_x, position_y)
+                 or self._check_optional_position(bottom_left_x, bottom_left_y)
+                 or self._check_optional_position(top_right_x, top_right_y)
+                 or self._check_amounts(radius=radius, limit=limit))
+        if error:
+            return None, {"error": error}
+        return surface_api.find_tiles_filtered(bottom_left_x, bottom_left_y, top_right_x, top_right_y,
+                                               position_x, position_y, radius, name, limit), None
+
+    def _parse_tiles_response(self, response: str) -> List[Dict[str, Any]]:
+        tiles = self._parse_json_response(response)
+        return tiles if tiles else []
 
-    def find_surface_tile(self, 
+    def find_surface_tile(self,
                     name: Optional[Union[str, List[str]]] = None,
                     position_x: Optional[float] = None,
                     position_y: Optional[float] = None,
@@ -344,9 +772,30 @@ class FactorioInterface:
                     bottom_left_y: Optional[float] = None,
                     top_right_x: Optional[float] = None,
                     top_right_y: Optional[float] = None,
-                    limit: Optional[int] = None) -> List[Dict[str, Any]]:
+                    limit: Optional[int] = None) -> Union[List[Dict[str, Any]], Dict[str, str]]:
         """Find the tile at the specified coordinates"""
-        command = self.api.Surface.find_tiles_filtered(bottom_left_x, bottom_left_y, top_right_x, top_right_y, position_x, position_y, radius, name, limit)
-        response = self._send_command(command)
-        tiles = self._parse_json_response(response)
-        return tiles if tiles else []
\ No newline at end of file
+        request = self._build_find_surface_tile(name, position_x, position_y, radius,
+                                                bottom_left_x, bottom_left_y, top_right_x, top_right_y, limit)
+        return self._call(request, self._parse_tiles_response)
+
+    async def find_surface_tile_async(self,
+                    name: Optional[Union[str, List[str]]] = None,
+                    position_x: Optional[float] = None,
+                    position_y: Optional[float] = None,
+                    radius: Optional[float] = None,
+                    bottom_left_x: Optional[float] = None,
+                    bottom_left_y: Optional[float] = None,
+                    top_right_x: Optional[float] = None,
+                    top_right_y: Optional[float] = None,
+                    limit: Optional[int] = None) -> Union[List[Dict[str, Any]], Dict[str, str]]:
+        """Async version of find_surface_tile()."""
+        request = self._build_find_surface_tile(name, position_x, position_y, radius,
+                                                bottom_left_x, bottom_left_y, top_right_x, top_right_y, limit)
+        return await self._call_async(request, self._parse_tiles_response, batched=True)
+
+    async def close_async(self) -> None:
+        """Close the persistent connection and the pooled connections of the running event loop."""
+        self.close()
+        pool = self._pools.pop(asyncio.get_running_loop(), None)
+        if pool is not None:
+            await pool.close()
\ No newline at end of file
@@ -0,0 +1,96 @@
+"""
+Lua command builders for entities on the surface, freeplay scenario (/c).
+"""
+
+import functools
+from api.lua import minify
+from api.prototype import quote_name
+from api.freeplay.inventory import _insert_item_body, _remove_item_body
+
+
+_SEARCH_ENTITIES = minify("""/c local entities = game.surfaces[1].find_entities_filtered{ %s }
+            if entities then
+                local entity_data = {}
+                for _, entity in ipairs(entities) do
+                    table.insert(entity_data, {name = entity.name, position = entity.position, type = entity.type})
+                end
+                rcon.print(helpers.table_to_json(entity_data))
+            else
+                rcon.print('Failed: No entities found with the specified filters.')
+            end
+            """)
+
+# surface.can_place_entity checks according to the entity's collision box, while player.can_place_entity checks according to the player's reach distance and some other factors.
+_PLACE_ENTITY = minify("""/c local player = game.get_player(1)
+            if  game.get_player(1).get_main_inventory().get_item_count('%(name)s') > 0 and game.surfaces[1].can_place_entity{name='%(name)s', position={%(x)s,%(y)s}} and player.can_place_entity{name='%(name)s', position={%(x)s,%(y)s}} then
+                game.surfaces[1].create_entity{name='%(name)s', position={x=%(x)s, y=%(y)s},direction= %(direction)s, force=game.forces.player}    
+                rcon.print('Success: Entity %(name)s placed')
+                %(consume)s
+            else
+                rcon.print('Failed: Cannot place entity %(name)s')
+            end
+            """)
+
+_REMOVE_ENTITY = minify("""/c local entity = game.surfaces[1].find_entity('%(name)s', {%(x)s,%(y)s}) 
+            if entity and game.get_player(1).can_reach_entity(entity) then 
+            entity.destroy() rcon.print('Success: Entity %(name)s removed') %(refund)s
+            elseif not entity then rcon.print('Failed: Entity %(name)s not found')
+            else rcon.print('Failed: Cannot reach %(name)s')
+            end
+            """)
+
+
+def search_entities(bottom_left_x: float = None, bottom_left_y: float = None, top_right_x: float = None, top_right_y: float = None, position_x: float = None, position_y: float = None, radius: float = None, name: list = None, type: str = None, limit: int = None):
+    """Find entities in the game based on specified filters.
+
+    Args:
+        bottom_left_x: The bottom-left x coordinate of the search area (optional).
+        bottom_left_y: The bottom-left y coordinate of the search area (optional).
+        top_right_x: The top-right x coordinate of the search area (optional).
+        top_right_y: The top-right y coordinate of the search area (optional).
+        position_x: The x coordinate of the center of the search circle (optional).
+        position_y: The y coordinate of the center of the search circle (optional).
+        radius: The radius of the search circle (optional).
+        name: A list of entity prototype names to filter by (optional).
+        type: The entity type to filter by (optional).
+        limit: The maximum number of entities to return (optional).
+    """
+    filter_params = []
+    if name:
+        if isinstance(name, str):
+            filter_params.append("name = " + quote_name(name))
+        elif isinstance(name, list):
+            filter_params.append("name = { %s }" % ", ".join(map(quote_name, name)))
+    if type:
+        filter_params.append(f"type = '{type}'")
+    if limit:
+        filter_params.append(f"limit = {limit}")
+    if bottom_left_x is not None and bottom_left_y is not None and top_right_x is not None and top_right_y is not None:
+        filter_params.append(f"area={{ {{ {bottom_left_x}, {bottom_left_y} }}, {{ {top_right_x}, {top_right_y} }} }}")
+    if position_x is not None and position_y is not None and radius is not None:
+        filter_params.append(f"position={{ {position_x}, {position_y} }}, radius={radius}")
+    filter_string = ", ".join(filter_params)
+
+    return _SEARCH_ENTITIES % filter_string
+
+
+@functools.lru_cache(maxsize=256)
+def place_entity(name: str, x: float, y: float, direction: int = 0):
+    """Place an entity in the game.
+    Args:
+        name: The entity prototype name to create.
+        x: the x coordinate of the entity
+        y: the y coordinate of the entity
+        direction: the direction of the entity (default 0) 0, 4, 8, 12 means up, right, down, left
+    """
+    return _PLACE_ENTITY % {"name": name, "x": x, "y": y, "direction": direction, "consume": _remove_item_body(name, 1)}
+
+
+@functools.lru_cache(maxsize=256)
+def remove_entity(name: str, x: float, y: float):
+    """Remove an entity in the game.
+    Args:
+        name: The entity prototype name to remove.
+        x: the x coordinate of the entity
+        y: the y coordinate of the entity"""
+    return _REMOVE_ENTITY % {"name": name, "x": x, "y": y, "refund": _insert_item_body(name, 1)}
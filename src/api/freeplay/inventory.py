@@ -0,0 +1,148 @@
+"""
+Lua command builders for player and entity inventories, freeplay scenario (/c).
+"""
+
+import functools
+from api.lua import minify
+
+_PREFIX = "/c "
+
+
+_INSERT_INTO_PLAYER = "game.get_player(1).get_inventory(defines.inventory.%(inventory_type)s).insert{name='%(item)s', count=%(count)s} rcon.print('Success: %(item)s added to player %(inventory_type)s')"
+
+_INSERT_INTO_ENTITY = minify("""local entity = game.surfaces[1].find_entity('%(entity)s', {%(x)s,%(y)s})
+                if entity then
+                    entity.get_inventory(defines.inventory.%(inventory_type)s).insert{name='%(item)s', count=%(count)s}
+                    rcon.print('Success: Item %(item)s added to %(entity)s %(inventory_type)s')
+                else
+                    rcon.print('Failed: Entity %(entity)s not found')
+                end
+                """)
+
+# %% escapes the Lua string.format specifiers
+_REMOVE_FROM_PLAYER = minify("""local main_inventory = game.get_player(1).get_main_inventory()
+                if main_inventory.get_item_count('%(item)s') >= %(count)s then
+                    main_inventory.remove({name='%(item)s', count=%(count)s}) 
+                    rcon.print('Success: %(item)s removed from player')
+                else
+                    rcon.print(string.format('Failed: %%s count is %%d', '%(item)s', main_inventory.get_item_count('%(item)s')))
+                end
+                """)
+
+_REMOVE_FROM_ENTITY = minify("""local entity = game.surfaces[1].find_entity('%(entity)s', {%(x)s,%(y)s})
+                if entity and entity.then
+                    entity.get_inventory(1).remove{name='%(item)s', count=%(count)s}
+                    rcon.print('Item %(item)s removed')
+                else
+                    rcon.print('Entity %(item)s not found')
+                end
+                """)
+
+_GET_PLAYER_INVENTORY = minify("""/c local inventory = game.get_player(1).get_inventory(defines.inventory.%(inventory_type)s)
+                if inventory then
+                    inventory_json=helpers.table_to_json(inventory.get_contents())
+                    rcon.print(inventory_json)
+                else
+                    rcon.print('Failed: Inventory %(inventory_type)s not found for player.')
+                end
+                """)
+
+_GET_ENTITY_INVENTORY = minify("""/c local entity = game.surfaces[1].find_entity('%(entity)s', {%(x)s,%(y)s})
+                if entity then
+                    local inventory = entity.get_inventory(defines.inventory.%(inventory_type)s)
+                    if inventory then
+                        inventory_json=helpers.table_to_json(inventory.get_contents())
+                        rcon.print(inventory_json)
+                    else
+                        rcon.print('Failed: Inventory %(inventory_type)s not found for %(entity)s.')
+                    end
+                else
+                    rcon.print('Entity %(entity)s not found.')
+                end
+                """)
+
+
+# def get_available_inventory_types():
+#     inventory_types = [
+#     "fuel",
+#     # "burnt_result",
+#     "chest",
+#     # "logistic_container_trash",
+#     "furnace_source",
+#     "furnace_result",
+#     # "furnace_modules",
+#     "character_main",
+#     "character_guns",
+#     "character_ammo",
+#     "character_armor",
+#     # "character_vehicle",
+#     "character_trash",
+#     "assembling_machine_input",
+#     "assembling_machine_output",
+#     # "assembling_machine_modules",
+#     # "assembling_machine_dump"
+#     ]
+#     return inventory_types
+
+
+@functools.lru_cache(maxsize=256)
+def _insert_item_body(item: str, count: int, inventory_type: str = "character_main", entity: str = "player", x: float = None, y: float = None):
+    """Lua statements of insert_item() without the command prefix, for embedding in other commands."""
+    if entity == "player":
+        return _INSERT_INTO_PLAYER % {"item": item, "count": count, "inventory_type": inventory_type}
+    else:
+        return _INSERT_INTO_ENTITY % {"item": item, "count": count, "inventory_type": inventory_type, "entity": entity, "x": x, "y": y}
+
+
+@functools.lru_cache(maxsize=256)
+def _remove_item_body(item: str, count: int, entity: str = "player", x: float = None, y: float = None):
+    """Lua statements of remove_item() without the command prefix, for embedding in other commands."""
+    if entity == "player":
+        return _REMOVE_FROM_PLAYER % {"item": item, "count": count}
+    else:
+        return _REMOVE_FROM_ENTITY % {"item": item, "count": count, "entity": entity, "x": x, "y": y}
+
+
+@functools.lru_cache(maxsize=256)
+def insert_item(item: str, count: int,inventory_type: str = "character_main", entity: str = "player", x: float = None, y: float = None):
+    """Insert certain numbers of items into entity, default insert into player main inventory.
+    if into other entities inventory, specify the name and position of this entity
+    Args:
+        item: The item name to insert
+        count: The count of the item
+        entity(optional): The name of the entity to insert
+        x(if entity specified): the x coordinate of the entity
+        y(if entity specified): the y coordinate of the entity
+        inventory_type(optional): the type of inventory to insert into.("fuel","chest","furnace_source","furnace_result","character_main","character_guns","character_ammo","character_armor","character_trash","assembling_machine_input","assembling_machine_output",)
+    """
+    return _PREFIX + _insert_item_body(item, count, inventory_type, entity, x, y)
+
+
+@functools.lru_cache(maxsize=256)
+def remove_item(item: str, count: int, entity: str = "player",x: float = None, y: float = None):
+    """Remove certain numbers of items from entity, default remove from player main inventory.
+    if from other entities inventory, specify the name and position of this entity
+    Args:
+        item: The item name to remove
+        count: The count of the item
+        entity(optional): The name of the entity to remove
+        x: the x coordinate of the entity
+        y: the y coordinate of the entity
+    """
+    return _PREFIX + _remove_item_body(item, count, entity, x, y)
+
+
+@functools.lru_cache(maxsize=256)
+def get_inventory(inventory_type: str, entity: str = "player", x: float = None, y: float = None):
+    """Get inventory content from entity, default get player main inventory. 
+    if from other entities inventory, specify the name and position of this entity
+    Args:
+        inventory_type: The type of inventory to get.("fuel","chest","furnace_source","furnace_result","character_main","character_guns","character_ammo","character_armor","character_trash","assembling_machine_input","assembling_machine_output",)
+        entity(optional): The name of the entity to get.
+        x: the x coordinate of the entity
+        y: the y coordinate of the entity
+    """
+    if entity == "player":
+        return _GET_PLAYER_INVENTORY % {"inventory_type": inventory_type}
+    else:
+        return _GET_ENTITY_INVENTORY % {"inventory_type": inventory_type, "entity": entity, "x": x, "y": y}
@@ -0,0 +1,25 @@
+"""
+Lua command builders for the player, freeplay scenario (/c).
+"""
+
+import functools
+
+
+_GET_PLAYER_POSITION = "/c rcon.print(helpers.table_to_json(game.get_player(1).position))"
+
+_MOVE_TO = "/c game.get_player(1).teleport({y = %s, x = %s})"
+
+
+def get_player_position():
+    """Get the player's current position."""
+    return _GET_PLAYER_POSITION
+
+
+@functools.lru_cache(maxsize=256)
+def move_to(x: float, y: float):
+    """Move the player to a specific position.
+    Args:
+        x: the x coordinate of the player
+        y: the y coordinate of the player
+    """
+    return _MOVE_TO % (y, x)
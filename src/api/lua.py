@@ -0,0 +1,19 @@
+"""
+Helpers for the Lua source embedded in RCON commands.
+"""
+
+
+def minify(source: str) -> str:
+    """Collapse a multi-line Lua template onto a single line.
+
+    Leading/trailing whitespace is stripped from every line, blank lines are dropped
+    and the remaining lines are joined with single spaces. Lua does not need newlines
+    between statements, so this is safe for templates without `--` comments.
+
+    Args:
+        source: the Lua source as written in the module, indentation included
+
+    Returns:
+        The same statements on one line
+    """
+    return " ".join(line for line in map(str.strip, source.splitlines()) if line)
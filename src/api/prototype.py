@@ -6,6 +6,9 @@ items, recipes and their relationships.
 """
 #TODO: It should be replaced by another agent to search the information from the internet or the local database.
 
+import re
+import sys
+
 ENTITY_TYPES = {
     "production": ["assembling-machine", "furnace", "mining-drill"],
     "logistics": ["transport-belt", "splitter", "underground-belt", "inserter", "chest"],
@@ -290,28 +293,81 @@ RECIPES = {
     }
 }
 
+_ENERGY_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kMGT]?)([WJ])\s*$")
+_SI_PREFIX = {"": 1.0, "k": 1e3, "M": 1e6, "G": 1e9, "T": 1e12}
+
+def _parse_energy(value):
+    """Parse a power or energy string such as "90kW" or "8MJ" into watts or joules, or None if it is not one"""
+    match = _ENERGY_RE.match(value) if isinstance(value, str) else None
+    if match is None:
+        return None
+    number, prefix, _ = match.groups()
+    return float(number) * _SI_PREFIX[prefix]
+
+# Numeric values of power (W) and energy (J) strings, parsed once at import. They are kept
+# apart from ENTITIES and ITEMS, so the prototype info returned to the agent is unchanged.
+_ENERGY_FIELDS = (("energy_consumption", "energy_consumption_w"), ("power_output", "power_output_w"),
+                  ("power_input", "power_input_w"), ("energy_capacity", "energy_capacity_j"))
+_ENTITY_ENERGY = {}
+for _name, _data in ENTITIES.items():
+    _values = {key: _parse_energy(_data[field]) for field, key in _ENERGY_FIELDS if field in _data}
+    _values = {key: value for key, value in _values.items() if value is not None}
+    if _values:
+        _ENTITY_ENERGY[_name] = _values
+_FUEL_VALUE_J = {}
+for _name, _data in ITEMS.items():
+    _value = _parse_energy(_data.get("fuel_value"))
+    if _value is not None:
+        _FUEL_VALUE_J[_name] = _value
+del _name, _data, _values, _value
+
+# Lookup indexes built once at import
+ENTITY_NAMES = tuple(sys.intern(name) for name in ENTITIES)
+ITEM_NAMES = tuple(sys.intern(name) for name in ITEMS)
+RECIPE_NAMES = tuple(RECIPES)
+_ENTITY_SET = frozenset(ENTITIES)
+_ITEM_SET = frozenset(ITEMS)
+_ENTITY_BY_LOWER = {name.lower(): name for name in ENTITIES}
+# Names as quoted Lua string literals, for the command builders
+QUOTED_NAME = {name: sys.intern("'%s'" % name) for name in ENTITY_NAMES + ITEM_NAMES}
+_ENTITIES_BY_TYPE = {}
+for _name, _data in ENTITIES.items():
+    _ENTITIES_BY_TYPE.setdefault(_data["type"], []).append(_name)
+_RECIPE_BY_RESULT = {}
+for _recipe in RECIPES.values():
+    # Keep the first recipe producing an item, as the linear scan did
+    _RECIPE_BY_RESULT.setdefault(_recipe["result"], _recipe)
+del _name, _data, _recipe
+# Compact, immutable per-type name columns
+_ENTITIES_BY_TYPE = {entity_type: tuple(names) for entity_type, names in _ENTITIES_BY_TYPE.items()}
+
 def get_entity_names():
-    """Get the list of valid entity names"""
-    return list(ENTITIES.keys())
+    """Get the valid entity names"""
+    return ENTITY_NAMES
 
 def get_entity_by_type(entity_type):
     """Get the list of entities of the specified type"""
-    return [name for name, data in ENTITIES.items() if data["type"] == entity_type]
+    return list(_ENTITIES_BY_TYPE.get(entity_type, ()))
 
 def get_item_names():
-    """Get the list of valid item names"""
-    return list(ITEMS.keys())
+    """Get the valid item names"""
+    return ITEM_NAMES
 
 def get_recipe_names():
-    """Get the list of valid recipe names"""
-    return list(RECIPES.keys())
+    """Get the valid recipe names"""
+    return RECIPE_NAMES
 
 def get_recipe_for_item(item_name):
     """Get the recipe for the specified item"""
-    for recipe_name, recipe in RECIPES.items():
-        if recipe["result"] == item_name:
-            return recipe
-    return None
+    return _RECIPE_BY_RESULT.get(item_name)
+
+def quote_name(name):
+    """Get the name as a quoted Lua string literal, reusing the precomputed literal for known prototypes"""
+    return QUOTED_NAME.get(name) or "'%s'" % name
+
+def get_entity_names_by_lower():
+    """Get the mapping of lowercased entity name to canonical entity name"""
+    return _ENTITY_BY_LOWER
 
 def get_entity_info(entity_name):
     """Get the detailed information of the entity"""
@@ -321,10 +377,18 @@ def get_item_info(item_name):
     """Get the detailed information of the item"""
     return ITEMS.get(item_name)
 
+def get_entity_energy(entity_name):
+    """Get the parsed power (W) and energy (J) values of the entity, e.g. {"energy_consumption_w": 90000.0}"""
+    return dict(_ENTITY_ENERGY.get(entity_name, ()))
+
+def get_fuel_value(item_name):
+    """Get the fuel value of the item in joules, or None if it is not a fuel"""
+    return _FUEL_VALUE_J.get(item_name)
+
 def is_valid_entity(name):
     """Check if the entity name is valid"""
-    return name in ENTITIES
+    return name in _ENTITY_SET
 
 def is_valid_item(name):
     """Check if the item name is valid"""
-    return name in ITEMS
\ No newline at end of file
+    return name in _ITEM_SET
\ No newline at end of file
@@ -0,0 +1,274 @@
+"""
+RCON Connection Pool Module
+
+This module provides an asyncio pool of warm RCON connections to a Factorio server,
+so that independent tool calls issued concurrently by the agent can overlap their
+network round-trips instead of serializing on a single socket.
+Without anyio, blocking RCON clients are used and their I/O runs in worker threads.
+"""
+
+import asyncio
+import logging
+import socket
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+import factorio_rcon as rcon
+
+try:
+    import anyio
+    import anyio.abc
+    _HAS_ANYIO = True
+except ImportError:
+    _HAS_ANYIO = False
+
+logger = logging.getLogger('rcon_pool')
+
+PoolClient = Union[rcon.AsyncRCONClient, rcon.RCONClient]
+
+def set_socket_options(client: PoolClient) -> None:
+    """
+    Tune the socket of a freshly connected RCON client for small request/response traffic:
+    disable Nagle's algorithm so short commands are sent immediately, and enable TCP
+    keepalive so dead connections are detected early.
+
+    Args:
+        client: A connected RCON client
+    """
+    sock = client.rcon_socket
+    if sock is not None and not isinstance(sock, socket.socket):
+        # anyio socket stream of an AsyncRCONClient
+        sock = sock.extra(anyio.abc.SocketAttribute.raw_socket, None)
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    except OSError as e:
+        logger.warning("Failed to set RCON socket options: %s", e)
+
+class RconPool:
+    """
+    Pool of pre-connected asynchronous RCON clients.
+    Clients are handed out through an asyncio.Queue, so each connection serves one
+    command at a time while up to `size` commands run concurrently.
+    Commands submitted through submit() within the same short window are coalesced
+    and pipelined over a single connection in one round-trip.
+    """
+
+    def __init__(self, host: str, port: int, password: str, size: int = 4, max_inactive_lifetime: float = 300.0,
+                 batch_window: float = 0.005, batch_size: int = 16):
+        """
+        Initialize the pool. No connection is opened until the pool is started.
+
+        Args:
+            host: RCON server hostname or IP address
+            port: RCON server port
+            password: RCON password
+            size: Number of connections kept in the pool
+            max_inactive_lifetime: Seconds a connection may sit idle before it is re-established on acquire
+            batch_window: Seconds submit() waits to collect more commands before sending a batch
+            batch_size: Number of pending commands that triggers an immediate batch send
+        """
+        self.host = host
+        self.port = port
+        self.password = password
+        self.size = max(1, size)
+        self.max_inactive_lifetime = max_inactive_lifetime
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._last_used: Dict[PoolClient, float] = {}
+        self._started = False
+        self.batch_window = batch_window
+        self.batch_size = max(1, batch_size)
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
+
+    def _new_client(self) -> PoolClient:
+        """Create an unconnected client, falling back to the blocking client without anyio."""
+        if _HAS_ANYIO:
+            return rcon.AsyncRCONClient(self.host, self.port, self.password)
+        return rcon.RCONClient(self.host, self.port, self.password, connect_on_init=False)
+
+    async def _call(self, method: Callable, *args: Any) -> Any:
+        """Await an async client method, or run a blocking one in a worker thread."""
+        if _HAS_ANYIO:
+            return await method(*args)
+        return await asyncio.to_thread(method, *args)
+
+    async def _open(self, client: PoolClient) -> None:
+        """(Re)connect a client and tune its socket."""
+        await self._call(client.connect)
+        set_socket_options(client)
+
+    async def _connect(self) -> PoolClient:
+        """Open and authenticate a new RCON connection."""
+        client = self._new_client()
+        await self._open(client)
+        return client
+
+    async def start(self) -> None:
+        """Connect all pool clients concurrently."""
+        if self._started:
+            return
+        self._started = True
+        results = await asyncio.gather(*(self._connect() for _ in range(self.size)), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                # Keep the slot; acquire() connects it on demand
+                logger.warning("Failed to pre-connect RCON pool client: %s", result)
+                result = self._new_client()
+            self.release(result)
+        logger.info("RCON pool started with %d connections", self.size)
+
+    async def acquire(self) -> PoolClient:
+        """
+        Take a connection from the pool, reconnecting it first if it is broken or has been idle too long.
+
+        Returns:
+            PoolClient: A connected RCON client that must be given back with release()
+        """
+        if not self._started:
+            await self.start()
+        client = await self._queue.get()
+        idle = time.monotonic() - self._last_used.get(client, 0.0)
+        if client.rcon_socket is None or client.rcon_failure or idle > self.max_inactive_lifetime:
+            try:
+                await self._open(client)
+            except Exception:
+                self.release(client)
+                raise
+        return client
+
+    async def warmup(self) -> None:
+        """
+        Connect every pool slot up front, so the first commands do not pay the RCON handshake.
+        Slots that failed to pre-connect or went stale are reconnected concurrently.
+        """
+        await self.start()
+        clients = await asyncio.gather(*(self.acquire() for _ in range(self.size)), return_exceptions=True)
+        for client in clients:
+            if isinstance(client, Exception):
+                logger.warning("Failed to warm up RCON pool client: %s", client)
+            else:
+                self.release(client)
+
+    async def keepalive(self, interval: float = 60.0, command: str = "/time") -> None:
+        """
+        Periodically send a cheap command over each idle connection so it stays warm.
+        Runs until cancelled; meant to be started as a background task.
+
+        Args:
+            interval: Seconds between keepalive rounds
+            command: Command used to ping the server
+        """
+        while True:
+            await asyncio.sleep(interval)
+            for _ in range(self._queue.qsize()):
+                try:
+                    client = await self.acquire()
+                except Exception as e:
+                    logger.warning("RCON keepalive failed to reconnect: %s", e)
+                    continue
+                try:
+                    await self._call(client.send_command, command)
+                except Exception as e:
+                    logger.warning("RCON keepalive failed: %s", e)
+                finally:
+                    self.release(client)
+
+    def release(self, client: PoolClient) -> None:
+        """Give a connection back to the pool."""
+        self._last_used[client] = time.monotonic()
+        self._queue.put_nowait(client)
+
+    async def send_commands(self, commands: Dict[Any, str]) -> Dict[Any, str]:
+        """
+        Send several commands over one pooled connection. All request packets are written
+        before any response is read, so the whole batch costs a single round-trip.
+        A batch is only resent if the connection failed before anything was written.
+
+        Args:
+            commands: Mapping of key -> command
+
+        Returns:
+            Dict[Any, str]: Mapping of key -> server response
+        """
+        client = await self.acquire()
+        try:
+            try:
+                responses = await self._call(client.send_commands, commands)
+            except rcon.RCONNotConnected as e:
+                # Raised before any packet is written, so the batch can be resent. Other network
+                # errors may come after the server ran some commands, and commands such as
+                # insert_item or place_entity must not run twice: those are raised to the caller,
+                # and the client (closed by factorio_rcon) is reconnected on its next acquire().
+                logger.warning("RCON pool connection lost, reconnecting: %s", e)
+                await self._open(client)
+                responses = await self._call(client.send_commands, commands)
+        finally:
+            self.release(client)
+        return {key: response if response else "" for key, response in responses.items()}
+
+    async def send_command(self, command: str) -> str:
+        """
+        Send a command over a pooled connection and return the response.
+
+        Args:
+            command: The command to send
+
+        Returns:
+            str: The server response
+        """
+        return (await self.send_commands({0: command}))[0]
+
+    def submit(self, command: str) -> asyncio.Future:
+        """
+        Queue a command for batched sending.
+        Commands submitted within batch_window of each other are sent together.
+
+        Args:
+            command: The command to send
+
+        Returns:
+            asyncio.Future: Resolves to the server response
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((command, future))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        """Send every pending command as one batch."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._send_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _send_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Send a batch of commands and resolve their futures."""
+        try:
+            responses = await self.send_commands({i: command for i, (command, _) in enumerate(batch)})
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for i, (_, future) in enumerate(batch):
+            if not future.done():
+                future.set_result(responses[i])
+
+    async def close(self) -> None:
+        """Close every idle connection in the pool."""
+        while not self._queue.empty():
+            client = self._queue.get_nowait()
+            await self._call(client.close)
+        self._last_used.clear()
+        self._started = False
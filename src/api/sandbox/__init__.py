@@ -0,0 +1 @@
+from . import entity, inventory, player, state, surface
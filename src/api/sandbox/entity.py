@@ -0,0 +1,136 @@
+"""
+Lua command builders for entities on the surface, sandbox scenario (/sc).
+"""
+
+import functools
+from api.lua import minify
+from api.prototype import quote_name
+from api.sandbox.inventory import _insert_item_body
+
+
+
+class EntityStatus:
+    WORKING = 1
+    NO_POWER = 2
+    NO_FUEL = 4
+    LOW_POWER = 8
+    NO_MINABLE_RESOURCES = 16
+    DISABLED_BY_CONTROL_BEHAVIOR = 32
+    DISABLED_BY_SCRIPT = 64
+    ITEM_INGREDIENT_SHORTAGE = 128
+    FLUID_INGREDIENT_SHORTAGE = 256
+    FULL_OUTPUT = 512
+    NO_RESEARCH_IN_PROGRESS = 1024
+
+
+_SEARCH_ENTITIES = minify("""/sc %slocal entities = game.surfaces[1].find_entities_filtered{ %s }
+            local entity_count = #entities
+            if entities and entity_count > 0 then
+                local names, xs, ys, directions, statuses, types = {}, {}, {}, {}, {}, {}
+                for i, entity in ipairs(entities) do
+                    names[i] = entity.name
+                    xs[i] = entity.position.x
+                    ys[i] = entity.position.y
+                    directions[i] = entity.direction
+                    statuses[i] = entity.status or false
+                    types[i] = entity.type
+                end
+                rcon.print(helpers.table_to_json({name = names, x = xs, y = ys, direction = directions, status = statuses, type = types}))
+            else
+                rcon.print('Failed: No entities found with the specified filters.')
+            end
+            """)
+
+# surface.can_place_entity checks according to the entity's collision box, while player.can_place_entity checks according to the player's reach distance and some other factors.
+_PLACE_ENTITY = minify("""/sc local player = game.get_player(1)
+            local surface_can_place = game.surfaces[1].can_place_entity{name='%(name)s', position={%(x)s,%(y)s}}
+            local player_can_place = player.can_place_entity{name='%(name)s', position={%(x)s,%(y)s}}
+            local filter = {filter="name", name='%(name)s'}
+
+            if surface_can_place and player_can_place then
+                game.surfaces[1].create_entity{name='%(name)s', position={x=%(x)s, y=%(y)s}, direction=%(direction)s, force=game.forces.player}
+                rcon.print('Success: Entity %(name)s placed')
+            else
+                if not surface_can_place then
+                    rcon.print('Failed: Cannot place %(name)s due to collision with other entities or terrain')
+                elseif not player_can_place then
+                    rcon.print('Failed: Cannot place %(name)s - position is out of player reach distance')
+                end
+            end
+            """)
+
+_REMOVE_ENTITY = minify("""/sc local entity = game.surfaces[1].find_entity('%(name)s', {%(x)s,%(y)s})
+            local player = game.get_player(1)
+            if entity and player.can_reach_entity(entity) then
+                entity.destroy()
+                rcon.print('Success: Entity %(name)s removed')
+                %(refund)s
+            elseif not entity then rcon.print('Failed: Entity %(name)s not found')
+            else rcon.print('Failed: Cannot reach %(name)s')
+            end
+            """)
+
+
+def search_entities(bottom_left_x: float = None, bottom_left_y: float = None, top_right_x: float = None, top_right_y: float = None, position_x: float = None, position_y: float = None, radius: float = None, name: list = None, type: str = None, limit: int = None):
+    """Find entities in the game based on specified filters.
+
+    Args:
+        bottom_left_x: The bottom-left x coordinate of the search area (optional).
+        bottom_left_y: The bottom-left y coordinate of the search area (optional).
+        top_right_x: The top-right x coordinate of the search area (optional).
+        top_right_y: The top-right y coordinate of the search area (optional).
+        position_x: The x coordinate of the center of the search circle (optional, defaults to the player position).
+        position_y: The y coordinate of the center of the search circle (optional, defaults to the player position).
+        radius: The radius of the search circle (optional).
+        name: A list of entity prototype names to filter by (optional).
+        type: The entity type to filter by (optional).
+        limit: The maximum number of entities to return (optional).
+    """
+    filter_params = []
+    if name:
+        if isinstance(name, str):
+            filter_params.append("name = " + quote_name(name))
+        elif isinstance(name, list):
+            filter_params.append("name = { %s }" % ", ".join(map(quote_name, name)))
+    if type:
+        filter_params.append(f"type = '{type}'")
+    if limit:
+        filter_params.append(f"limit = {limit}")
+    if bottom_left_x is not None and bottom_left_y is not None and top_right_x is not None and top_right_y is not None:
+        filter_params.append(f"area={{ {{ {bottom_left_x}, {bottom_left_y} }}, {{ {top_right_x}, {top_right_y} }} }}")
+    # A radius search without a full center defaults to the player position, read on the server side
+    player_position = ""
+    if radius is not None:
+        if position_x is None or position_y is None:
+            player_position = "local player_position = game.get_player(1).position "
+        center_x = position_x if position_x is not None else "player_position.x"
+        center_y = position_y if position_y is not None else "player_position.y"
+        filter_params.append(f"position={{ {center_x}, {center_y} }}, radius={radius}")
+    filter_string = ", ".join(filter_params)
+
+    return _SEARCH_ENTITIES % (player_position, filter_string)
+
+
+@functools.lru_cache(maxsize=256)
+def place_entity(name: str, x: float, y: float, direction: int = 0):
+    """Place an entity in the game.
+    Args:
+        name: The entity prototype name to create.
+        x: the x coordinate of the entity
+        y: the y coordinate of the entity
+        direction: the direction of the entity (default 0) 0, 4, 8, 12 means up, right, down, left
+    """
+    return _PLACE_ENTITY % {"name": name, "x": x, "y": y, "direction": direction}
+
+
+# TODO: catch error when insert item after remove entity
+@functools.lru_cache(maxsize=256)
+def remove_entity(name: str, x: float, y: float):
+    """Remove an entity in the game.
+    Args:
+        name: The entity prototype name to remove.
+        x: the x coordinate of the entity
+        y: the y coordinate of the entity"""
+    # Give the removed entity back to the player
+    refund = _insert_item_body(name, 1, entity="player")
+    return _REMOVE_ENTITY % {"name": name, "x": x, "y": y, "refund": refund}
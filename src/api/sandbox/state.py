@@ -0,0 +1,35 @@
+"""
+Lua command builders that read several pieces of game state at once, sandbox scenario (/sc).
+"""
+
+import functools
+from api.lua import minify
+
+
+_SNAPSHOT_ENTITIES = minify("""local entities = game.surfaces[1].find_entities_filtered{ position = player.position, radius = %s%s }
+            local entity_data = {}
+            for _, entity in ipairs(entities) do
+                table.insert(entity_data, {name = entity.name, position = entity.position, direction = entity.direction, status = entity.status, type = entity.type})
+            end
+            result.entities = entity_data""")
+
+
+@functools.lru_cache(maxsize=256)
+def get_snapshot(position: bool = True, inventory: bool = True, radius: float = None, limit: int = None):
+    """Read several pieces of game state in one command and print them as a single JSON object.
+    Args:
+        position: include the player's position under "position"
+        inventory: include the player's main inventory contents under "inventory"
+        radius(optional): include entities within this radius of the player under "entities"
+        limit(optional): the maximum number of entities to include
+    """
+    parts = ["/sc local player = game.get_player(1)", "local result = {}"]
+    if position:
+        parts.append("result.position = player.position")
+    if inventory:
+        parts.append("result.inventory = player.get_main_inventory().get_contents()")
+    if radius is not None:
+        limit_param = f", limit = {limit}" if limit else ""
+        parts.append(_SNAPSHOT_ENTITIES % (radius, limit_param))
+    parts.append("rcon.print(helpers.table_to_json(result))")
+    return " ".join(parts)
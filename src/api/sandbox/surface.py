@@ -0,0 +1,49 @@
+"""
+Lua command builders for surface tiles, sandbox scenario (/sc).
+"""
+
+from api.lua import minify
+from api.prototype import quote_name
+
+
+_FIND_TILES = minify("""/sc local tiles = game.surfaces[1].find_tiles_filtered{ %s }
+            if tiles then
+                local tile_data = {}
+                for _, tile in ipairs(tiles) do
+                    table.insert(tile_data, {name = tile.name, position = tile.position})
+                end
+                rcon.print(helpers.table_to_json(tile_data))
+            else
+                rcon.print('Failed: No tiles found with the specified filters.')
+            end
+            """)
+
+
+def find_tiles_filtered(bottom_left_x: float, bottom_left_y: float, top_right_x: float, top_right_y: float, position_x: float, position_y: float, radius: float, name: list = None, limit: int = None):
+    """Find tiles in the game based on specified filters.
+
+    Args:
+        bottom_left_x: The bottom-left x coordinate of the search area (optional).
+        bottom_left_y: The bottom-left y coordinate of the search area (optional).
+        top_right_x: The top-right x coordinate of the search area (optional).
+        top_right_y: The top-right y coordinate of the search area (optional).
+        position_x: The x coordinate of the center of the search circle (optional).
+        position_y: The y coordinate of the center of the search circle (optional).
+        radius: The radius of the search circle (optional).
+        name: A list of tile names to filter by (optional).
+        limit: The maximum number of tiles to return (optional).
+    """
+    filter_params = []
+    if name:
+        if isinstance(name, str):
+            filter_params.append("name = " + quote_name(name))
+        elif isinstance(name, list):
+            filter_params.append("name = { %s }" % ", ".join(map(quote_name, name)))
+    if bottom_left_x is not None and bottom_left_y is not None and top_right_x is not None and top_right_y is not None:
+        filter_params.append(f"area={{ {{ {bottom_left_x}, {bottom_left_y} }}, {{ {top_right_x}, {top_right_y} }} }}")
+    if position_x is not None and position_y is not None and radius is not None:
+        filter_params.append(f"position={{ {position_x}, {position_y} }}, radius={radius}")
+    if limit:
+        filter_params.append(f"limit = {limit}")
+    filter_string = ", ".join(filter_params)
+    return _FIND_TILES % filter_string
@@ -57,10 +57,10 @@ class BaseCrawler:
                 if response.status == 200:
                     return await response.text()
                 else:
-                    self.logger.error(f"Failed to fetch {url}: Status {response.status}")
+                    self.logger.error("Failed to fetch %s: Status %s", url, response.status)
                     return ""
         except Exception as e:
-            self.logger.error(f"Error fetching {url}: {str(e)}")
+            self.logger.error("Error fetching %s: %s", url, e)
             return ""
 
     def parse_html(self, html_content: str) -> BeautifulSoup:
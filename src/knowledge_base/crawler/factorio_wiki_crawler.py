@@ -38,7 +38,7 @@ class FactorioWikiCrawler(BaseCrawler):
             return
 
         self.visited_urls.add(url)
-        self.logger.info(f"Crawling: {url} at depth {self.current_depth}")
+        self.logger.info("Crawling: %s at depth %d", url, self.current_depth)
 
         html_content = await self.fetch_page(url)
         if not html_content:
@@ -48,7 +48,7 @@ class FactorioWikiCrawler(BaseCrawler):
         
         # Check for 'Space Age' feature immediately after parsing, before any content extraction
         if self._has_space_age_feature_at_top(soup):
-            self.logger.info(f"Skipping {url} due to 'Space Age expansion exclusive feature' at the top.")
+            self.logger.info("Skipping %s due to 'Space Age expansion exclusive feature' at the top.", url)
             return
 
         if self._is_target_page(url):
@@ -1,9 +1,13 @@
 import logging
-import toml
 import asyncio
 import os
-from agents import Agent, Runner, set_default_openai_key, set_trace_processors
+import textwrap
+from typing import Any, Dict
+from agents import Agent, AgentsException, Runner, set_default_openai_key, set_trace_processors
+from factorio_rcon import RCONBaseError
+from openai import OpenAIError
 from langsmith.wrappers import OpenAIAgentsTracingProcessor
+from utils.log_queue import configure_queue_logging
 from agent.tool.agent_tools import (
     get_player_position,
     move_player,
@@ -13,10 +17,13 @@ from agent.tool.agent_tools import (
     insert_item,
     remove_item,
     get_inventory,
-    query_api_knowledge_base
+    get_snapshot,
+    query_api_knowledge_base,
+    get_config,
+    get_factorio_interface
 )
 
-config = toml.load("config/config.toml")
+config = get_config()
 set_default_openai_key(config["openai"]["OPENAI_API_KEY"])
 
 # LangSmith environment variables for tracing
@@ -26,11 +33,7 @@ os.environ["LANGSMITH_API_KEY"] = config["langsmith"]["api_key"]
 os.environ["LANGSMITH_PROJECT"] = config["langsmith"]["project"]
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    filename='factorio_agent.log'
-)
+configure_queue_logging('factorio_agent.log', level=logging.INFO)
 logger = logging.getLogger('factorio_agent')
 
 # Create an agent
@@ -47,6 +50,7 @@ factorio_agent = Agent(
         insert_item,
         remove_item,
         get_inventory,
+        get_snapshot,
         query_api_knowledge_base
     ],
 )
@@ -57,41 +61,119 @@ Add error handling mechanisms: When the agent encounters an error during executi
 **Reduce unnecessary environment queries:** Optimize the agent's logic and reduce the number of times it queries the environment.
 """
 
+# Prompts sent to the agent, dedented once at import; {state} is filled in per step
+_INITIAL_MSG = textwrap.dedent("""
+    The world is now loaded and ready to play. The current game state (player position, nearby entities, and inventory) is:
+    {state}
+    Analyze the current state and provide an initial strategy.
+    Remember to add appropriate filtering parameters when using find_entities to avoid returning too much information.
+    """).strip()
+
+_STEP_MSG = textwrap.dedent("""
+    Please proceed with your plan. The latest game state is:
+    {state}
+    Decide and execute the next action based on the current state and the results of your previous actions.
+    Remember to add appropriate filtering parameters when using find_entities to avoid returning too much information.
+    """).strip()
+
+# Sent in place of the state when the read before a step fails or times out
+_STATE_UNAVAILABLE = "unavailable, read it with get_snapshot"
+
+async def read_game_state(radius: float = 20) -> Dict[str, Any]:
+    """
+    Read the player position, nearby entities and main inventory in a single RCON round-trip.
+
+    Args:
+        radius: Radius around the player to include entities from
+
+    Returns:
+        Dict with 'position', 'inventory' and 'entities' keys
+    """
+    factorio = get_factorio_interface()
+    try:
+        state = await factorio.get_snapshot_async(radius=radius)
+        if state:
+            return state
+    except (RCONBaseError, OSError) as e:
+        logger.warning("Snapshot read failed, reading the state piece by piece: %r", e)
+    # Fall back to the individual reads, issued concurrently so they still cost about one round-trip
+    position, entities, inventory = await asyncio.gather(
+        factorio.get_player_position_async(),
+        factorio.search_entities_async(radius=radius),
+        factorio.get_inventory_async()
+    )
+    return {"position": position, "entities": entities, "inventory": inventory}
+
+async def await_game_state(state_task: "asyncio.Task[Dict[str, Any]]", timeout: float) -> Any:
+    """
+    Wait for a game state read started earlier with read_game_state().
+
+    Args:
+        state_task: Task running read_game_state()
+        timeout: Maximum number of seconds to wait; the read is cancelled after that
+
+    Returns:
+        The game state, or a note telling the agent to read it itself
+    """
+    try:
+        return await asyncio.wait_for(state_task, timeout)
+    except (asyncio.TimeoutError, RCONBaseError, OSError) as e:
+        # OSError covers dropped or refused pool connections (ConnectionError and socket errors)
+        logger.warning("Game state read failed: %r", e)
+        return _STATE_UNAVAILABLE
+    finally:
+        if not state_task.done():
+            state_task.cancel()
+
 async def main():
     """Main Loop"""
     logger.info("Starting Factorio Agent")
     get_player_position #unlock the commands ability which is locked by achievements system
+    # Connect the RCON pool before the first tool call and keep it warm between steps
+    factorio = get_factorio_interface()
+    await factorio.pool.warmup()
+    keepalive_task = asyncio.create_task(factorio.pool.keepalive(config["rcon"].get("keepalive_interval", 60)))
+    # Resolve settings once, outside the step loop
+    agent_config = config["agent"]
+    state_radius = agent_config.get("state_radius", 20)
+    max_steps = agent_config.get("max_steps", 100)
+    step_delay = agent_config.get("step_delay", 5)
+    state_timeout = agent_config.get("state_timeout", 5)
     try:
-        initial_message = """
-        The world is now loaded and ready to play. Pls first use the tool function to get the current game state (player position, nearby entities, and inventory),
-        then analyze the current state and provide an initial strategy.
-        Remember to add appropriate filtering parameters when using find_entities to avoid returning too much information.
-        """
-        result = await Runner.run(factorio_agent, initial_message, max_turns=20)
-        logger.info(f"agent response: {result.final_output}")
+        state = await read_game_state(state_radius)
+        result = await Runner.run(factorio_agent, _INITIAL_MSG.format(state=state), max_turns=20)
+        logger.info("agent response: %s", result.final_output)
 
         step_count = 0
-        max_steps = config["agent"].get("max_steps", 100)
-        step_delay = config["agent"].get("step_delay", 5)
+        # Steps start on a fixed cadence: time spent in the previous step counts towards the delay
+        clock = asyncio.get_running_loop().time
+        deadline = clock()
         while step_count < max_steps:
-            await asyncio.sleep(step_delay)
-
-            message = """
-            Please proceed with your plan. First, use the utility function to get the latest game state,
-            and then decide and execute the next action based on the current state and the results of your previous actions.
-            Remember to add appropriate filtering parameters when using find_entities to avoid returning too much information.
-            """
+            # Read the state during the delay so the round-trip does not add to the step time
+            state_task = asyncio.create_task(read_game_state(state_radius))
+            deadline = max(deadline + step_delay, clock())
+            delay = deadline - clock()
+            if delay > 0:
+                await asyncio.sleep(delay)
 
-            result = await Runner.run(factorio_agent, message,max_turns=40)
-            logger.info(f"Step {step_count + 1} - Agent response: {result.final_output}")
+            state = await await_game_state(state_task, state_timeout)
+            try:
+                result = await Runner.run(factorio_agent, _STEP_MSG.format(state=state), max_turns=40)
+            except (AgentsException, OpenAIError) as e:
+                # A failed step (turn limit, model or API error) is logged and the run goes on
+                logger.error("Step %d failed: %s", step_count + 1, e)
+            else:
+                logger.info("Step %d - Agent response: %s", step_count + 1, result.final_output)
             
             step_count += 1
 
     except KeyboardInterrupt:
         logger.info("Agent stopped by user")
-    except Exception as e:
-        logger.error(f"Error in main loop: {e}",exc_info=True)
+    except (AgentsException, OpenAIError, RCONBaseError) as e:
+        # Only runtime failures are handled here; programming errors propagate
+        logger.error("Error in main loop: %s", e, exc_info=True)
     finally:
+        keepalive_task.cancel()
         logger.info("Agent stopped")
 
 if __name__ == "__main__":
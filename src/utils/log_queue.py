@@ -0,0 +1,46 @@
+"""
+Non-blocking File Logging
+
+logging.basicConfig(filename=...) writes and flushes every record on the thread
+that logs it. configure_queue_logging() sets up the same file logging, but the
+logging call only enqueues the record and a background QueueListener does the
+file I/O.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+from typing import Optional
+
+DEFAULT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+def configure_queue_logging(filename: str,
+                            level: int = logging.INFO,
+                            format: str = DEFAULT_FORMAT) -> Optional[logging.handlers.QueueListener]:
+    """
+    Log to a file through a queue, as a drop-in replacement for logging.basicConfig().
+
+    Like basicConfig(), this does nothing if the root logger already has handlers.
+
+    Args:
+        filename: Log file to append to
+        level: Root logger level
+        format: Format string for the log records
+
+    Returns:
+        The started QueueListener (stopped automatically at exit), or None if logging was already configured
+    """
+    root = logging.getLogger()
+    if root.handlers:
+        return None
+    file_handler = logging.FileHandler(filename)
+    file_handler.setFormatter(logging.Formatter(format))
+    records: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(records, file_handler, respect_handler_level=True)
+    listener.start()
+    # Stopping the listener drains the queue, so records logged just before exit still reach the file
+    atexit.register(listener.stop)
+    root.setLevel(level)
+    root.addHandler(logging.handlers.QueueHandler(records))
+    return listener
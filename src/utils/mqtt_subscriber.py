@@ -6,34 +6,71 @@ This script subscribes to MQTT topics from Node-RED agent workflow and
 executes the corresponding actions in the Factorio game.
 """
 import time
+import functools
 import json
 import logging
-import toml
+import queue
+import socket
+import threading
+try:
+    import tomllib
+except ImportError:
+    import tomli as tomllib
+try:
+    import orjson
+    _json_loads = orjson.loads
+    # Returns bytes, which publish() sends as-is; non-str keys are stringified like json.dumps does
+    _json_dumps = functools.partial(orjson.dumps, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
 from paho.mqtt import client as mqtt_client
 from api.factorio_interface import FactorioInterface
-from typing import Optional
+from utils.log_queue import configure_queue_logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import os
 
-# Logging configuration
-logging.basicConfig(
+# Logging configuration; file writes happen on a background thread, never on the paho network loop
+configure_queue_logging(
+    'factorio_mqtt.log',
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    filename='factorio_mqtt.log'
+    format='%(asctime)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger('factorio_mqtt')
 
+# Send buffer for the broker connection, large enough for a full batch of responses
+_SEND_BUFFER_SIZE = 256 * 1024
+
 class FactorioMQTTSubscriber:
     def __init__(self, config_path: str = "config.toml"):
         try:
             script_dir = os.path.dirname(os.path.abspath(__file__))
             config_path = os.path.join(script_dir, "config.toml")
-            self.config = toml.load(config_path)
+            with open(config_path, "rb") as f:
+                self.config = tomllib.load(f)
         except Exception as e:
             print(f"Error loading config.toml: {e}")
             exit(1)
         self.mqtt_config = self.config.get("mqtt", {})
+        # Topics are resolved once here rather than on every message
+        self.command_topic = self.mqtt_config.get("command_topic", "Factorio/Commands")
+        self.plan_topic = self.mqtt_config.get("plan_topic", "Factorio/Plans")
+        self.response_topic = self.mqtt_config.get("response_topic", "Factorio/Responses")
         self.factorio: Optional[FactorioInterface] = None
         self.client = None
+        # Command name -> handler(params), built once the Factorio connection exists
+        self.handlers: Dict[str, Callable[[dict], Any]] = {}
+        # Commands are queued by on_message and executed in batches by a worker thread,
+        # so the paho network loop never waits on RCON
+        # Bounded, so a flood of commands is rejected instead of piling up behind RCON
+        self._commands: "queue.Queue[Optional[Tuple[str, dict]]]" = queue.Queue(maxsize=self.mqtt_config.get("queue_size", 1024))
+        self._worker: Optional[threading.Thread] = None
+        self.batch_size = self.mqtt_config.get("batch_size", 64)
+        self.batch_window = self.mqtt_config.get("batch_window", 0.002)  # seconds to wait for more commands
+        # Publish each batch as one {"batch": [...]} message instead of one message per command
+        self.batch_responses = self.mqtt_config.get("batch_responses", False)
+        # Seconds shutdown waits for the worker to finish the queued commands
+        self.shutdown_timeout = self.mqtt_config.get("shutdown_timeout", 10)
         self.retry_interval = 5  # retry interval (seconds)
         self.max_retries = 3      # maximum retry attempts
 
@@ -47,6 +84,7 @@ class FactorioMQTTSubscriber:
                     self.config["rcon"]["port"],
                     self.config["rcon"]["password"]
                 )
+                self.handlers = self._build_handlers(self.factorio)
                 print("Successfully connected to Factorio server")
                 return True
             except Exception as e:
@@ -56,25 +94,76 @@ class FactorioMQTTSubscriber:
                     print(f"Retrying in {self.retry_interval} seconds...")
                     time.sleep(self.retry_interval)
                 else:
-                    logger.error(f"Failed to connect to Factorio server after {self.max_retries} attempts: {e}")
+                    logger.error("Failed to connect to Factorio server after %d attempts: %s", self.max_retries, e)
                     print(f"Failed to connect to Factorio server after {self.max_retries} attempts: {e}")
                     return False
 
-    def on_connect(self, client, userdata, flags, rc):
+    @staticmethod
+    def _build_handlers(factorio: FactorioInterface) -> Dict[str, Callable[[dict], Any]]:
+        """Build the command dispatch table, mapping each command name to a handler of its params"""
+        return {
+            "get_player_position": lambda p: factorio.get_player_position(),
+            "move_player": lambda p: factorio.move_player(p.get("x"), p.get("y")),
+            "place_entity": lambda p: factorio.place_entity(p.get("name"), p.get("x"), p.get("y"), p.get("direction", 0)),
+            "remove_entity": lambda p: factorio.remove_entity(p.get("name"), p.get("x"), p.get("y")),
+            "search_entities": lambda p: factorio.search_entities(
+                name=p.get("name"), type=p.get("type"),
+                position_x=p.get("position_x"), position_y=p.get("position_y"),
+                radius=p.get("radius", 10), limit=p.get("limit", 25)),
+            "get_inventory": lambda p: factorio.get_inventory(
+                entity=p.get("entity", "player"), inventory_type=p.get("inventory_type"),
+                x=p.get("x"), y=p.get("y")),
+            "insert_item": lambda p: factorio.insert_item(
+                p.get("item"), p.get("count"),
+                entity=p.get("entity", "player"), inventory_type=p.get("inventory_type", "main"),
+                x=p.get("x"), y=p.get("y")),
+            "remove_item": lambda p: factorio.remove_item(
+                p.get("item"), p.get("count"),
+                entity=p.get("entity", "player"), x=p.get("x"), y=p.get("y")),
+            "list_supported_entities": lambda p: factorio.list_supported_entities(
+                p.get("mode", "all"), p.get("search_type"), p.get("keyword")),
+            "list_supported_items": lambda p: factorio.list_supported_items(),
+            # Prototype data is static for a session and served from the interface's caches;
+            # reload_prototypes drops them after a mod or config change
+            "get_available_prototypes": lambda p: factorio.get_available_prototypes(),
+            "reload_prototypes": lambda p: factorio.reload_prototypes() or {"reloaded": True},
+            "find_surface_tile": lambda p: factorio.find_surface_tile(
+                p.get("name"), p.get("position_x"), p.get("position_y"), p.get("radius", 10), limit=p.get("limit", 25)),
+        }
+
+    def on_connect(self, client, userdata, flags, reason_code, properties):
         """MQTT connect callback"""
-        if rc == 0:
+        if not reason_code.is_failure:
+            self._tune_socket(client)
+            if flags.session_present:
+                # The broker kept our persistent session, subscriptions included
+                logger.info("Resumed MQTT session")
+                return
             # Subscribe to both topics
-            client.subscribe(self.mqtt_config.get("command_topic", "Factorio/Commands"))
-            client.subscribe(self.mqtt_config.get("plan_topic", "Factorio/Plans"))
-            logger.info("Subscribed to topics: Factorio/Commands and Factorio/Plans")
+            client.subscribe(self.command_topic)
+            client.subscribe(self.plan_topic)
+            logger.info("Subscribed to topics: %s and %s", self.command_topic, self.plan_topic)
         else:
-            logger.error(f"Failed to connect to MQTT Broker, return code {rc}")
+            logger.error("Failed to connect to MQTT Broker, reason code %s", reason_code)
+
+    @staticmethod
+    def _tune_socket(client):
+        """Send small responses immediately (no Nagle delay) and enlarge the send buffer"""
+        sock = client.socket()
+        if sock is None or not hasattr(sock, "setsockopt"):
+            # Not connected, or a websocket transport that doesn't expose the TCP socket
+            return
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, _SEND_BUFFER_SIZE)
+        except OSError as e:
+            logger.warning("Failed to set MQTT socket options: %s", e)
 
     def on_message(self, client, userdata, msg):
         """MQTT message callback"""
         try:
             # Handle plan topic messages
-            if msg.topic == self.mqtt_config.get("plan_topic", "Factorio/Plans"):
+            if msg.topic == self.plan_topic:
                 plan_bytes = msg.payload
                 try:
                     plan_str = plan_bytes.decode('utf-8')
@@ -85,115 +174,92 @@ class FactorioMQTTSubscriber:
                 print(log)
                 return
             
-            payload = json.loads(msg.payload.decode())
+            # Both parsers accept the raw payload bytes, so skip decoding to str first
+            payload = _json_loads(msg.payload)
             log = f"Received from {msg.topic}: {payload}"
             logger.info(log)
             print(log)
             # Handle command topic messages
             command = payload.get("command")
             params = payload.get("params", {})
+            if not isinstance(command, str):
+                # Rejected here: an unhashable command would otherwise fail the handler lookup on the worker
+                self.publish_result(client, "error", {"error": f"Invalid command: {command!r}"}, success=False)
+                return
             
-            if command == "get_player_position":
-                result = self.factorio.get_player_position()
-                self.publish_result(client, command, result)
-            
-            elif command == "move_player":
-                x = params.get("x")
-                y = params.get("y")
-                result = self.factorio.move_player(x, y)
-                self.publish_result(client, command, result)
-            
-            elif command == "place_entity":
-                name = params.get("name")
-                x = params.get("x")
-                y = params.get("y")
-                direction = params.get("direction", 0)
-                result = self.factorio.place_entity(name, x, y, direction)
-                self.publish_result(client, command, result)
-            
-            elif command == "remove_entity":
-                name = params.get("name")
-                x = params.get("x")
-                y = params.get("y")
-                result = self.factorio.remove_entity(name, x, y)
-                self.publish_result(client, command, result)
-            
-            elif command == "search_entities":
-                name = params.get("name")
-                entity_type = params.get("type")
-                radius = params.get("radius", 10)
-                position_x = params.get("position_x")
-                position_y = params.get("position_y")
-                limit = params.get("limit", 25)
-                result = self.factorio.search_entities(name, entity_type, position_x, position_y, radius, limit=limit)
-                self.publish_result(client, command, result)
-            
-            elif command == "get_inventory":
-                entity = params.get("entity", "player")
-                x = params.get("x")
-                y = params.get("y")
-                result = self.factorio.get_inventory(entity, x, y)
-                self.publish_result(client, command, result)
-            
-            elif command == "insert_item":
-                item = params.get("item")
-                count = params.get("count")
-                inventory_type = params.get("inventory_type", "main")
-                entity = params.get("entity", "player")
-                x = params.get("x")
-                y = params.get("y")
-                result = self.factorio.insert_item(item, count, inventory_type, entity, x, y)
-                self.publish_result(client, command, result)
-            
-            elif command == "remove_item":
-                item = params.get("item")
-                count = params.get("count")
-                entity = params.get("entity", "player")
-                x = params.get("x")
-                y = params.get("y")
-                result = self.factorio.remove_item(item, count, entity, x, y)
-                self.publish_result(client, command, result)
-            
-            elif command == "list_supported_entities":
-                mode = params.get("mode", "all")
-                search_type = params.get("search_type")
-                keyword = params.get("keyword")
-                result = self.factorio.list_supported_entities(mode, search_type, keyword)
-                self.publish_result(client, command, result)
-            
-            elif command == "list_supported_items":
-                result = self.factorio.list_supported_items()
-                self.publish_result(client, command, result)
-
-            elif command == "find_surface_tile":
-                name = params.get("name")
-                position_x = params.get("position_x")
-                position_y = params.get("position_y")
-                radius = params.get("radius", 10)
-                limit = params.get("limit", 25)
-                result = self.factorio.find_surface_tile(name, position_x, position_y, radius, limit=limit)
-                self.publish_result(client, command, result)
-                
-            else:
-                logger.warning(f"Unknown command: {command}")
-                self.publish_result(client, command, {"error": f"Unknown command: {command}"}, success=False)
+            try:
+                self._commands.put_nowait((command, params))
+            except queue.Full:
+                logger.warning("Command queue full, rejecting %s", command)
+                self.publish_result(client, command, {"error": "Command queue full, try again later"}, success=False)
         
         except Exception as e:
-            logger.error(f"Error processing message: {e}", exc_info=True)
+            logger.error("Error processing message: %s", e, exc_info=True)
             self.publish_result(client, "error", {"error": str(e)}, success=False)
 
+    def _next_batch(self) -> Optional[List[Tuple[str, dict]]]:
+        """Block for the next command, then collect whatever else arrives within the batch window"""
+        first = self._commands.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._commands.get(timeout=remaining) if remaining > 0 else self._commands.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Finish this batch, then let the worker see the stop signal
+                self._commands.put_nowait(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _execute(self, command: str, params: dict) -> Dict[str, Any]:
+        """Run one command and return its response payload"""
+        handler = self.handlers.get(command)
+        if not handler:
+            logger.warning("Unknown command: %s", command)
+            return {"command": command, "result": {"error": f"Unknown command: {command}"}}
+        try:
+            return {"command": command, "result": handler(params)}
+        except Exception as e:
+            logger.error("Error executing %s: %s", command, e, exc_info=True)
+            return {"command": command, "result": {"error": str(e)}}
+
+    def _process_commands(self):
+        """Worker loop: execute queued commands batch by batch and publish their responses"""
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            payloads = [self._execute(command, params) for command, params in batch]
+            if self.batch_responses:
+                self.publish_batch(self.client, payloads)
+            else:
+                for payload in payloads:
+                    self.publish_result(self.client, payload["command"], payload["result"])
+
     def publish_result(self, client, command, result, success=True):
         """Publish the result of a command"""
-        response_topic = self.mqtt_config.get("response_topic", "Factorio/Responses")
         payload = {
             "command": command,
             "result": result
         }
-        client.publish(response_topic, json.dumps(payload))
+        client.publish(self.response_topic, _json_dumps(payload))
         log = f"Published feedback: {command}: {result}\n"
         logger.info(log)
         print(log)
 
+    def publish_batch(self, client, payloads: List[Dict[str, Any]]):
+        """Publish the results of a batch of commands as one {"batch": [{"command": ..., "result": ...}, ...]} message"""
+        client.publish(self.response_topic, _json_dumps({"batch": payloads}))
+        log = f"Published feedback batch: {', '.join(str(payload['command']) for payload in payloads)}\n"
+        logger.info(log)
+        print(log)
+
     def run(self):
         """Run MQTT subscriber"""
         if not self.initialize_factorio():
@@ -205,7 +271,12 @@ class FactorioMQTTSubscriber:
         username = self.mqtt_config.get("username", "")
         password = self.mqtt_config.get("password", "")
         
-        self.client = mqtt_client.Client(client_id=client_id)
+        # Persistent session: after a reconnect the broker still has our subscriptions
+        self.client = mqtt_client.Client(
+            mqtt_client.CallbackAPIVersion.VERSION2,
+            client_id=client_id,
+            clean_session=False
+        )
         
         if username and password:
             self.client.username_pw_set(username, password)
@@ -215,13 +286,15 @@ class FactorioMQTTSubscriber:
         
         try:
             self.client.connect(broker, port)
-            logger.info(f"Connected to MQTT broker: {broker}:{port}")
+            logger.info("Connected to MQTT broker: %s:%s", broker, port)
             print(f"Connected to MQTT broker: {broker}:{port}")
         except Exception as e:
-            logger.error(f"Failed to connect to MQTT broker: {e}")
+            logger.error("Failed to connect to MQTT broker: %s", e)
             print(f"Failed to connect to MQTT broker: {e}")
             return
         
+        self._worker = threading.Thread(target=self._process_commands, name="factorio-mqtt-worker", daemon=True)
+        self._worker.start()
         self.client.loop_start()
         
         try:
@@ -230,8 +303,18 @@ class FactorioMQTTSubscriber:
         except KeyboardInterrupt:
             logger.info("Subscriber stopped by user")
         finally:
-            self.client.loop_stop()
+            # Let the worker finish the queued commands while the network loop still runs,
+            # so their responses are published; a stuck RCON call must not hang shutdown
+            try:
+                self._commands.put(None, timeout=self.shutdown_timeout)
+                self._worker.join(timeout=self.shutdown_timeout)
+            except queue.Full:
+                pass
+            if self._worker.is_alive():
+                logger.warning("Command worker did not finish within %ss, dropping queued commands", self.shutdown_timeout)
+            # The disconnect is queued behind the published responses, then the loop is stopped
             self.client.disconnect()
+            self.client.loop_stop()
             logger.info("Disconnected from MQTT broker")
 
 def main():
@@ -0,0 +1,82 @@
+"""
+Lua template preparation and metadata update decoding of the coding agent.
+"""
+
+import importlib.util
+import os
+import py_compile
+import shutil
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("agents")
+pytest.importorskip("sentence_transformers")
+
+_CONFIG_EXAMPLE = Path(__file__).resolve().parents[1] / "config" / "config_example.toml"
+
+
+@pytest.fixture(scope="module")
+def coding_agent(tmp_path_factory):
+    """The coding_agent module, imported against the example config."""
+    root = tmp_path_factory.mktemp("config_root")
+    (root / "config").mkdir()
+    shutil.copy(_CONFIG_EXAMPLE, root / "config" / "config.toml")
+    # coding_agent also reads the LangSmith settings, which the example leaves out
+    with open(root / "config" / "config.toml", "a") as f:
+        f.write('\n[langsmith]\ntracing = false\nendpoint = ""\napi_key = ""\nproject = ""\n')
+    cwd, environ = os.getcwd(), dict(os.environ)
+    os.chdir(root)
+    try:
+        from agent.agent import coding_agent
+    finally:
+        # get_config() caches by the relative default path, which now points elsewhere
+        from agent.runtime import get_config
+        get_config.cache_clear()
+        os.chdir(cwd)
+        os.environ.clear()
+        os.environ.update(environ)
+    return coding_agent
+
+
+@pytest.mark.parametrize("script, parameters, expected, count", [
+    ("rcon.print({x})", {"x": "", "y": ""}, "rcon.print({x})", 1),
+    ("local t = {1, 2} rcon.print(t[{i}])", {"i": ""}, "local t = {{1, 2}} rcon.print(t[{i}])", 1),
+    ("local t = {a} rcon.print({a}, {b})", {"a": ""}, "local t = {a} rcon.print({a}, {{b}})", 2),
+    ("local t = {{}}", {}, "local t = {{{{}}}}", 0),
+    ("rcon.print('}')", {}, "rcon.print('}}')", 0),
+])
+def test_format_template(coding_agent, script, parameters, expected, count):
+    assert coding_agent._format_template(script, parameters) == (expected, count)
+
+
+def test_formatted_template_renders_the_original_script(coding_agent):
+    script = "local pos = {x = {x}, y = {y}} game.get_player(1).teleport(pos) -- {note}"
+    template, count = coding_agent._format_template(script, {"x": "", "y": ""})
+    assert count == 2
+    assert template.format(x=3, y=-4) == "local pos = {x = 3, y = -4} game.get_player(1).teleport(pos) -- {note}"
+
+
+@pytest.mark.parametrize("value, current, expected", [
+    ("1.2.0", "1.0.0", "1.2.0"),
+    ("[1, 2]", "[1]", "[1, 2]"),
+    ('[{"name": "x"}]', [], [{"name": "x"}]),
+    ("3", 1, 3),
+    ("true", None, True),
+    ("not json", None, "not json"),
+])
+def test_decode_update_value(coding_agent, value, current, expected):
+    assert coding_agent._decode_update_value(value, current) == expected
+
+
+def test_write_module_atomic_compiles_before_writing(coding_agent, tmp_path):
+    module = tmp_path / "wrapper.py"
+    coding_agent._write_module_atomic(module, "VALUE = 1\n")
+    assert module.read_text() == "VALUE = 1\n"
+    assert Path(importlib.util.cache_from_source(str(module))).exists()
+    assert list(tmp_path.glob("*.tmp")) == []
+
+    broken = tmp_path / "broken.py"
+    with pytest.raises(py_compile.PyCompileError):
+        coding_agent._write_module_atomic(broken, "def broken(:\n")
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["__pycache__", "wrapper.py"]
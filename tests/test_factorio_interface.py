@@ -0,0 +1,177 @@
+"""
+Argument checks of FactorioInterface: names interpolated into Lua, entity names and positions.
+Commands are captured instead of sent, so no Factorio server is needed.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("factorio_rcon")
+
+from api.factorio_interface import FactorioInterface
+
+
+@pytest.fixture
+def factorio(monkeypatch):
+    """A FactorioInterface whose commands are recorded and answered with 'Success: ok'."""
+    sent = []
+
+    def send_command(self, command):
+        sent.append(command)
+        return "Success: ok"
+
+    async def send_command_async(self, command):
+        sent.append(command)
+        return "Success: ok"
+
+    monkeypatch.setattr(FactorioInterface, "_send_command", send_command)
+    monkeypatch.setattr(FactorioInterface, "_send_command_async", send_command_async)
+    monkeypatch.setattr(FactorioInterface, "send_batched", send_command_async)
+    interface = FactorioInterface()
+    sent.clear()  # the greeting sent by __init__
+    interface.sent = sent
+    return interface
+
+
+def test_check_entity_names(factorio):
+    assert factorio._check_entity_names(None) is None
+    assert factorio._check_entity_names("stone-furnace") is None
+    assert factorio._check_entity_names(["stone-furnace", "iron-ore"]) is None
+    assert factorio._check_entity_names("no-such-entity") == "Failed: Invalid entity name: no-such-entity"
+    assert factorio._check_entity_names(["stone-furnace", "nope"]) == "Failed: Invalid entity name: nope"
+
+
+@pytest.mark.parametrize("names", [
+    ("iron-plate",),
+    ("iron-plate", "player", None),
+    (["stone", "coal"],),
+    ("a" * 64,),
+])
+def test_check_lua_names_accepts_safe_names(factorio, names):
+    assert factorio._check_lua_names(*names) is None
+
+
+@pytest.mark.parametrize("name", [
+    "iron-plate'} game.print('x') --",
+    "Iron Plate",
+    "",
+    "a" * 65,
+    5,
+    ["coal", "bad'name"],
+])
+def test_check_lua_names_rejects_unsafe_names(factorio, name):
+    assert factorio._check_lua_names(name).startswith("Failed: Invalid name:")
+
+
+@pytest.mark.parametrize("x, y, valid", [
+    (0, 0, True),
+    (-12.5, 40.25, True),
+    (1_000_000, -1_000_000, True),
+    (1_000_000.5, 0, False),
+    (0, -2e9, False),
+    ("1", 0, False),
+    (None, 0, False),
+])
+def test_check_position(factorio, x, y, valid):
+    assert (factorio._check_position(x, y) is None) is valid
+
+
+@pytest.mark.parametrize("amounts, valid", [
+    ({}, True),
+    ({"count": 5, "radius": 2.5, "limit": None}, True),
+    ({"count": 0}, False),
+    ({"radius": -1}, False),
+    ({"limit": "5} game.print('x')"}, False),
+    ({"count": True}, False),
+    ({"radius": float("inf")}, False),
+    ({"radius": float("nan")}, False),
+])
+def test_check_amounts(factorio, amounts, valid):
+    assert (factorio._check_amounts(**amounts) is None) is valid
+
+
+def test_numeric_arguments_are_checked_before_sending(factorio):
+    assert factorio.remove_entity("stone-furnace", "0} game.print('x') --", 0)[0] is False
+    assert factorio.insert_item("coal", "5} game.print('x') --") == (False, "Failed: Invalid count: \"5} game.print('x') --\"")
+    assert factorio.insert_item("coal", 5, entity="stone-furnace", inventory_type="fuel", x=2e6, y=0)[0] is False
+    assert factorio.remove_item("coal", -1)[0] is False
+    assert "error" in factorio.get_inventory(entity="stone-furnace", inventory_type="fuel", x="1", y=2)
+    assert "error" in factorio.search_entities(name="coal", radius="10")
+    assert "error" in factorio.search_entities(bottom_left_x=0, bottom_left_y=0, top_right_x=None, top_right_y=5)
+    assert "error" in factorio.find_surface_tile(name="water", position_x=0, position_y=0, radius=3, limit=0)
+    assert factorio.sent == []
+
+    assert factorio.insert_item("coal", 5) == (True, "ok")
+    assert factorio.search_entities(name="coal", position_x=1, position_y=2, radius=10) == []
+    assert len(factorio.sent) == 2
+
+
+def test_place_entity_rejections_return_a_tuple(factorio):
+    assert factorio.place_entity("no-such-entity", 0, 0) == (False, "Failed: Invalid entity name: no-such-entity")
+    assert factorio.place_entity("stone-furnace", 0, 0, direction=3)[0] is False
+    assert factorio.place_entity("stone-furnace", 2e6, 0)[0] is False
+    assert factorio.sent == []
+    assert factorio.place_entity("stone-furnace", 1, 2, direction=4) == (True, "ok")
+    assert len(factorio.sent) == 1
+
+
+def test_place_entity_async_rejections_return_a_tuple(factorio):
+    result = asyncio.run(factorio.place_entity_async("no-such-entity", 0, 0))
+    assert result == (False, "Failed: Invalid entity name: no-such-entity")
+    assert factorio.sent == []
+
+
+def test_rejected_names_are_reported_as_error_dicts(factorio):
+    assert factorio.search_entities(name="no-such-entity") == {"error": "Failed: Invalid entity name: no-such-entity"}
+    assert factorio.search_entities(type="x' } game.print('pwn")["error"].startswith("Failed: Invalid name:")
+    assert factorio.find_surface_tile(name="Bad Tile")["error"].startswith("Failed: Invalid name:")
+    assert factorio.get_inventory(entity="x'y")["error"].startswith("Failed: Invalid name:")
+    assert factorio.remove_entity("x'y", 0, 0)[0] is False
+    assert factorio.insert_item("coal", 1, inventory_type="main'")[0] is False
+    assert factorio.sent == []
+
+
+def test_list_supported_entities_returns_fresh_results(factorio):
+    first = factorio.list_supported_entities("type", search_type="furnace")
+    assert set(first) == {"stone-furnace", "electric-furnace"}
+    first.clear()
+    assert factorio.list_supported_entities("type", search_type="furnace").keys() == {"stone-furnace", "electric-furnace"}
+    assert isinstance(factorio.list_supported_entities(), tuple)
+    assert factorio.list_supported_entities("type") == {"error": "Invalid search parameters"}
+
+
+def test_failed_command_is_not_resent(monkeypatch):
+    import factorio_rcon
+    from api import factorio_interface
+
+    sent = []
+
+    class Client:
+        def __init__(self, *args, **kwargs):
+            self.rcon_socket = None
+            self.rcon_failure = False
+
+        def connect(self):
+            self.rcon_socket = object()
+            self.rcon_failure = False
+
+        def close(self):
+            self.rcon_socket = None
+
+        def send_command(self, command):
+            sent.append(command)
+            if command == "/c fail":
+                # What factorio_rcon does when the response cannot be read
+                self.rcon_failure = True
+                self.close()
+                raise factorio_rcon.RCONReceiveError("receive failed")
+            return "ok"
+
+    monkeypatch.setattr(factorio_interface.rcon, "RCONClient", Client)
+    monkeypatch.setattr(factorio_interface, "set_socket_options", lambda client: None)
+    interface = FactorioInterface()
+    with pytest.raises(factorio_rcon.RCONReceiveError):
+        interface._send_command("/c fail")
+    assert interface._send_command("/c next") == "ok"
+    assert sent[1:] == ["/c fail", "/c next"]
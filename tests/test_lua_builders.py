@@ -0,0 +1,103 @@
+"""
+Output of the sandbox (/sc) and freeplay (/c) Lua command builders for fixed inputs.
+"""
+
+import pytest
+
+from api.freeplay import entity as freeplay_entity, inventory as freeplay_inventory, player as freeplay_player
+from api.lua import minify
+from api.sandbox import entity, inventory, player, state, surface
+
+
+def test_minify_joins_stripped_lines():
+    assert minify("""
+        local a = 1
+            if a then
+
+                rcon.print(a)
+            end
+        """) == "local a = 1 if a then rcon.print(a) end"
+
+
+@pytest.mark.parametrize("command, expected", [
+    (player.get_player_position(), "/sc rcon.print(helpers.table_to_json(game.get_player(1).position))"),
+    (player.move_to(1.5, -2), "/sc game.get_player(1).teleport({y = -2, x = 1.5})"),
+    (freeplay_player.move_to(1.5, -2), "/c game.get_player(1).teleport({y = -2, x = 1.5})"),
+    (inventory.insert_item("coal", 5),
+     "/sc game.get_player(1).get_main_inventory().insert{name='coal', count=5} rcon.print('Success: coal added to player')"),
+    (state.get_snapshot(inventory=False),
+     "/sc local player = game.get_player(1) local result = {} result.position = player.position "
+     "rcon.print(helpers.table_to_json(result))"),
+])
+def test_fixed_commands(command, expected):
+    assert command == expected
+
+
+def test_search_entities_filters():
+    command = entity.search_entities(name=["stone-furnace", "coal"], type="furnace", radius=10, limit=5)
+    assert command.startswith("/sc local player_position = game.get_player(1).position local entities = ")
+    assert ("find_entities_filtered{ name = { 'stone-furnace', 'coal' }, type = 'furnace', limit = 5, "
+            "position={ player_position.x, player_position.y }, radius=10 }") in command
+
+    # An explicit center does not read the player position
+    command = entity.search_entities(position_x=3, position_y=4, radius=2)
+    assert command.startswith("/sc local entities = game.surfaces[1].find_entities_filtered{ position={ 3, 4 }, radius=2 }")
+
+
+def test_snapshot_entities_part():
+    command = state.get_snapshot(radius=8, limit=50)
+    assert "result.inventory = player.get_main_inventory().get_contents()" in command
+    assert "find_entities_filtered{ position = player.position, radius = 8, limit = 50 }" in command
+    assert command.endswith("result.entities = entity_data rcon.print(helpers.table_to_json(result))")
+
+
+def test_find_tiles_filters():
+    command = surface.find_tiles_filtered(None, None, None, None, 1, 2, 3, name="water", limit=4)
+    assert command.startswith("/sc local tiles = game.surfaces[1].find_tiles_filtered{ "
+                              "name = 'water', position={ 1, 2 }, radius=3, limit = 4 }")
+
+
+def test_freeplay_place_entity_consumes_the_item():
+    command = freeplay_entity.place_entity("stone-furnace", 1, 2, 4)
+    assert "create_entity{name='stone-furnace', position={x=1, y=2},direction= 4, force=game.forces.player}" in command
+    assert "main_inventory.remove({name='stone-furnace', count=1})" in command
+
+
+# Every builder with representative arguments, for the checks below
+_COMMANDS = [
+    player.get_player_position(),
+    player.move_to(1.5, -2),
+    entity.search_entities(name="coal", radius=10, limit=5),
+    entity.search_entities(bottom_left_x=0, bottom_left_y=0, top_right_x=5, top_right_y=5),
+    entity.place_entity("stone-furnace", 1, 2, 4),
+    entity.remove_entity("stone-furnace", 1, 2),
+    inventory.insert_item("coal", 5),
+    inventory.insert_item("coal", 5, entity="stone-furnace", inventory_type="fuel", x=1, y=2),
+    inventory.remove_item("coal", 5),
+    inventory.remove_item("coal", 5, entity="wooden-chest", x=1, y=2),
+    inventory.get_inventory(),
+    inventory.get_inventory("stone-furnace", "fuel", 1, 2),
+    state.get_snapshot(radius=8, limit=50),
+    surface.find_tiles_filtered(0, 0, 5, 5, None, None, None, name=["water", "deepwater"]),
+    freeplay_player.move_to(1.5, -2),
+    freeplay_entity.search_entities(name="coal", radius=5, position_x=0, position_y=0),
+    freeplay_entity.place_entity("stone-furnace", 1, 2, 4),
+    freeplay_entity.remove_entity("stone-furnace", 1, 2),
+    freeplay_inventory.insert_item("coal", 5),
+    freeplay_inventory.remove_item("coal", 5),
+    freeplay_inventory.get_inventory("character_main"),
+]
+
+
+@pytest.mark.parametrize("command", _COMMANDS)
+def test_commands_are_single_line_and_fully_substituted(command):
+    assert command.startswith(("/sc ", "/c "))
+    assert "\n" not in command
+    assert "%(" not in command
+
+
+@pytest.mark.parametrize("command", _COMMANDS)
+def test_commands_are_valid_lua(command):
+    lupa = pytest.importorskip("lupa.lua52")
+    lua = lupa.LuaRuntime()
+    lua.compile(command.split(" ", 1)[1])
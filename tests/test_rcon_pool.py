@@ -0,0 +1,117 @@
+"""
+Batching of RconPool.submit(), checked against fake RCON clients.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("factorio_rcon")
+
+from api import rcon_pool
+from api.rcon_pool import RconPool
+
+
+class FakeClient:
+    """Blocking RCON client stand-in that records every send_commands() call."""
+
+    def __init__(self, calls, fail=False, errors=()):
+        self.calls = calls
+        self.fail = fail
+        # Exceptions raised by the next send_commands() calls, one per call
+        self.errors = list(errors)
+        self.rcon_socket = object()
+        self.rcon_failure = False
+
+    def connect(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send_commands(self, commands):
+        self.calls.append(dict(commands))
+        if self.fail:
+            raise ConnectionResetError("connection reset")
+        if self.errors:
+            raise self.errors.pop(0)
+        return {key: "re:" + command for key, command in commands.items()}
+
+
+@pytest.fixture
+def make_pool(monkeypatch):
+    """Build a pool of FakeClients; the blocking client path runs them in worker threads."""
+    monkeypatch.setattr(rcon_pool, "_HAS_ANYIO", False)
+    monkeypatch.setattr(rcon_pool, "set_socket_options", lambda client: None)
+
+    def make(calls, fail=False, errors=(), **kwargs):
+        kwargs.setdefault("size", 2)
+        pool = RconPool("localhost", 27015, "password", **kwargs)
+        pool._new_client = lambda: FakeClient(calls, fail, errors)
+        return pool
+
+    return make
+
+
+def test_commands_within_the_window_share_one_round_trip(make_pool):
+    calls = []
+    pool = make_pool(calls, batch_window=0.05)
+
+    async def run():
+        return await asyncio.gather(*(pool.submit(f"/c {i}") for i in range(3)))
+
+    assert asyncio.run(run()) == ["re:/c 0", "re:/c 1", "re:/c 2"]
+    assert calls == [{0: "/c 0", 1: "/c 1", 2: "/c 2"}]
+
+
+def test_full_batch_is_sent_without_waiting_for_the_window(make_pool):
+    calls = []
+    pool = make_pool(calls, batch_window=60, batch_size=2)
+
+    async def run():
+        first = [pool.submit("/c a"), pool.submit("/c b")]
+        # The batch window is a minute, so only the size limit can have sent these
+        return await asyncio.wait_for(asyncio.gather(*first), timeout=5)
+
+    assert asyncio.run(run()) == ["re:/c a", "re:/c b"]
+    assert calls == [{0: "/c a", 1: "/c b"}]
+
+
+def test_separate_windows_are_separate_batches(make_pool):
+    calls = []
+    pool = make_pool(calls, batch_window=0.01)
+
+    async def run():
+        first = await pool.submit("/c 1")
+        second = await pool.submit("/c 2")
+        return first, second
+
+    assert asyncio.run(run()) == ("re:/c 1", "re:/c 2")
+    assert calls == [{0: "/c 1"}, {0: "/c 2"}]
+
+
+def test_a_failed_batch_fails_every_command_in_it(make_pool):
+    calls = []
+    pool = make_pool(calls, fail=True, batch_window=0.01)
+
+    async def run():
+        return await asyncio.gather(pool.submit("/c x"), pool.submit("/c y"), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ConnectionResetError) for result in results)
+    assert len(calls) == 1
+
+
+def test_batch_is_resent_only_if_nothing_was_written(make_pool):
+    calls = []
+    pool = make_pool(calls, errors=[rcon_pool.rcon.RCONNotConnected("not connected")], size=1)
+    assert asyncio.run(pool.send_commands({"a": "/c a"})) == {"a": "re:/c a"}
+    assert calls == [{"a": "/c a"}, {"a": "/c a"}]
+
+
+def test_batch_is_not_resent_after_a_receive_error(make_pool):
+    calls = []
+    pool = make_pool(calls, errors=[rcon_pool.rcon.RCONReceiveError("receive failed")], size=1)
+    with pytest.raises(rcon_pool.rcon.RCONReceiveError):
+        asyncio.run(pool.send_commands({"a": "/c insert"}))
+    assert calls == [{"a": "/c insert"}]
@@ -0,0 +1,114 @@
+"""
+UnifiedToolManager bookkeeping: debounced metadata saves and spilled tool results.
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("agents")
+
+from agent.tool.unified_tool_manager import UnifiedToolManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = UnifiedToolManager(tools_dir=str(tmp_path / "generated"), save_delay=0.05,
+                                 max_inline_bytes=100, max_stored_outputs=2)
+    manager.saves = 0
+    save_metadata = manager._save_metadata
+
+    def counting_save():
+        manager.saves += 1
+        save_metadata()
+
+    manager._save_metadata = counting_save
+    yield manager
+    manager.flush()
+
+
+def test_burst_of_changes_is_saved_once(manager):
+    threads = [
+        threading.Thread(target=manager.register_generated_tool, args=(f"tool_{i}", {"version": "1.0.0"}))
+        for i in range(20)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert manager.tools_version == 20
+    time.sleep(0.3)
+    assert manager.saves == 1
+    assert UnifiedToolManager(tools_dir=str(manager.tools_dir)).tools_registry.keys() == manager.tools_registry.keys()
+
+
+def test_flush_writes_pending_changes_immediately(manager):
+    manager.register_generated_tool("tool", {"version": "1.0.0"})
+    manager.flush()
+    assert manager.saves == 1
+    assert manager.metadata_file.exists()
+    # The cancelled timer does not save again, and nothing is left to write
+    time.sleep(0.2)
+    manager.flush()
+    assert manager.saves == 1
+
+
+def test_changes_after_a_save_schedule_a_new_one(manager):
+    manager.register_generated_tool("tool", {"version": "1.0.0"})
+    manager.flush()
+    manager.update_tool_metadata("tool", {"description": "updated"})
+    time.sleep(0.3)
+    assert manager.saves == 2
+
+
+def test_small_results_are_returned_inline(manager):
+    result = {"items": list(range(20))}
+    assert manager._inline_or_spill(result) == {"result": result}
+    assert not manager.outputs_dir.exists()
+
+
+def test_spilled_result_round_trip(manager):
+    # Multi-byte characters: sizes, previews and offsets all count characters
+    result = {"entities": ["é" * 30, "ß" * 30] * 20}
+    spilled = manager._inline_or_spill(result)
+    assert "result" not in spilled
+    assert manager.outputs_dir == manager.tools_dir.parent / "tool_outputs"
+
+    content, offset = "", 0
+    while offset is not None:
+        chunk = manager.read_tool_output(spilled["result_ref"], offset, length=300)
+        assert chunk["success"]
+        assert chunk["total_length"] == spilled["total_length"]
+        content += chunk["content"]
+        offset = chunk["next_offset"]
+    assert len(content) == spilled["total_length"]
+    assert content.startswith(spilled["preview"])
+    assert json.loads(content) == result
+
+
+@pytest.mark.parametrize("ref", ["../tool_metadata", "0" * 31, "A" * 32, "0" * 32 + ".json"])
+def test_read_tool_output_rejects_invalid_references(manager, ref):
+    assert manager.read_tool_output(ref) == {"success": False, "message": f"Invalid result reference: {ref}"}
+
+
+def test_only_the_newest_results_are_kept(manager):
+    refs = [manager._inline_or_spill({"data": "x" * 200, "n": i})["result_ref"] for i in range(3)]
+    assert not manager.read_tool_output(refs[0])["success"]
+    assert all(manager.read_tool_output(ref)["success"] for ref in refs[1:])
+
+    # A new manager starts without the results of the previous one
+    UnifiedToolManager(tools_dir=str(manager.tools_dir))
+    assert not any(manager.read_tool_output(ref)["success"] for ref in refs)
+
+
+def test_concurrent_spills_keep_exactly_the_limit(manager):
+    threads = [threading.Thread(target=manager._inline_or_spill, args=({"data": "x" * 200, "n": i},))
+               for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(manager._stored_outputs) == 2
+    assert sorted(manager.outputs_dir.glob("*.json")) == sorted(manager._stored_outputs)